@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import functools
 import threading
-from contextlib import AbstractAsyncContextManager, ContextDecorator
+from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass, field
-from typing import Any, Iterable, List, Optional
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
 
 from hermetic.guards import install_all, uninstall_all
+from hermetic.util import DATACLASS_SLOTS
 
 # Process-wide merged policy state for guard activation.
 _LOCK = threading.RLock()
@@ -19,8 +21,35 @@ _ACTIVE_CONFIGS: list["BlockConfig"] = []
 # above one-line removal.
 _SEALED = False
 
-
-@dataclass
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+# Accepted keyword aliases for BlockConfig.from_kwargs: long and short
+# names map onto the dataclass field they set.
+_KWARG_ALIASES: dict[str, str] = {
+    "block_network": "block_network",
+    "no_network": "block_network",
+    "block_subprocess": "block_subprocess",
+    "no_subprocess": "block_subprocess",
+    "fs_readonly": "fs_readonly",
+    "fs_root": "fs_root",
+    "block_environment": "block_environment",
+    "no_environment": "block_environment",
+    "no_env": "block_environment",
+    "block_code_exec": "block_code_exec",
+    "no_code_exec": "block_code_exec",
+    "block_interpreter_mutation": "block_interpreter_mutation",
+    "no_interpreter_mutation": "block_interpreter_mutation",
+    "block_native": "block_native",
+    "allow_localhost": "allow_localhost",
+    "allow_domains": "allow_domains",
+    "deny_imports": "deny_imports",
+    "trace": "trace",
+    "sealed": "sealed",
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class BlockConfig:
     """Describe the guard policy contributed by one blocker instance."""
 
@@ -41,33 +70,12 @@ class BlockConfig:
     @classmethod
     def from_kwargs(cls, **kw: Any) -> "BlockConfig":
         """Normalize accepted keyword aliases into a config instance."""
-        # Accept both long and short kw names
-        mapping = {
-            "block_network": "block_network",
-            "no_network": "block_network",
-            "block_subprocess": "block_subprocess",
-            "no_subprocess": "block_subprocess",
-            "fs_readonly": "fs_readonly",
-            "fs_root": "fs_root",
-            "block_environment": "block_environment",
-            "no_environment": "block_environment",
-            "no_env": "block_environment",
-            "block_code_exec": "block_code_exec",
-            "no_code_exec": "block_code_exec",
-            "block_interpreter_mutation": "block_interpreter_mutation",
-            "no_interpreter_mutation": "block_interpreter_mutation",
-            "block_native": "block_native",
-            "allow_localhost": "allow_localhost",
-            "allow_domains": "allow_domains",
-            "deny_imports": "deny_imports",
-            "trace": "trace",
-            "sealed": "sealed",
-        }
         data: dict[str, Any] = {}
         for k, v in kw.items():
-            if k not in mapping:
+            field_name = _KWARG_ALIASES.get(k)
+            if field_name is None:
                 raise TypeError(f"Unknown argument: {k}")
-            data[mapping[k]] = v
+            data[field_name] = v
         return cls(**data)
 
     def __or__(self, other: "BlockConfig") -> "BlockConfig":
@@ -134,22 +142,23 @@ def _install_for_config(cfg: BlockConfig) -> None:
     )
 
 
-def _reapply_guards_locked() -> None:
-    """Reinstall guards to reflect the current active blocker stack."""
+def _reapply_guards_locked(effective: BlockConfig | None = None) -> None:
+    """Reinstall guards to reflect the current active blocker stack.
+
+    Callers that already merged the stack pass the result as ``effective``.
+    """
     if _SEALED:
         # In sealed mode, never uninstall; only widen / re-apply policy.
         if _ACTIVE_CONFIGS:
-            _install_for_config(_effective_config())
+            _install_for_config(effective or _effective_config())
         return
     uninstall_all()
     if _ACTIVE_CONFIGS:
-        _install_for_config(_effective_config())
+        _install_for_config(effective or _effective_config())
 
 
-class _HermeticBlocker(
-    ContextDecorator, AbstractAsyncContextManager["_HermeticBlocker"]
-):
-    """Manage a blocker policy as a sync or async context manager."""
+class _HermeticBlocker(AbstractAsyncContextManager["_HermeticBlocker"]):
+    """Manage a blocker policy as a sync or async context manager or decorator."""
 
     __slots__ = ("cfg", "_entered")
 
@@ -158,15 +167,37 @@ class _HermeticBlocker(
         self.cfg = cfg
         self._entered = False
 
+    # ---- decorator protocol ----
+    def __call__(self, func: _F) -> _F:
+        """Wrap ``func`` so every call runs under this blocker's policy."""
+        cfg = self.cfg
+
+        @functools.wraps(func)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            # A fresh blocker per call keeps recursive and concurrent calls
+            # from sharing one ``_entered`` flag.
+            with _HermeticBlocker(cfg):
+                return func(*args, **kwargs)
+
+        return inner  # type: ignore[return-value]
+
     # ---- sync protocol ----
     def __enter__(self) -> "_HermeticBlocker":
         """Activate this blocker policy for the current process."""
         global _SEALED
         with _LOCK:
+            before = _effective_config()
+            # The merge is a left fold, so the pushed config folds onto the
+            # previous result instead of re-merging the whole stack.
+            after = before.merged_with(self.cfg)
+            nested = bool(_ACTIVE_CONFIGS)
             _ACTIVE_CONFIGS.append(self.cfg)
             if self.cfg.sealed:
                 _SEALED = True
-            _reapply_guards_locked()
+            # A nested blocker that adds nothing to the merged policy leaves
+            # the installed guards as they are instead of reinstalling them.
+            if not nested or after != before:
+                _reapply_guards_locked(after)
             self._entered = True
         return self
 
@@ -175,11 +206,14 @@ class _HermeticBlocker(
         with _LOCK:
             if self._entered:
                 self._entered = False
+                before = _effective_config()
                 try:
                     _ACTIVE_CONFIGS.remove(self.cfg)
                 except ValueError:
                     pass
-                _reapply_guards_locked()
+                after = _effective_config()
+                if not _ACTIVE_CONFIGS or after != before:
+                    _reapply_guards_locked(after)
         # don’t suppress exceptions
 
     # ---- async protocol ----
@@ -3,11 +3,13 @@
 '''Bootstrap helpers for installing guards in a foreign interpreter.'''
 
 from __future__ import annotations
-import json
+import hashlib
 import os
+import py_compile
+import stat
 import tempfile
 from textwrap import dedent
-from typing import Dict, Any
+from typing import Any
 from .errors import BootstrapError
 
 # Minimal bootstrap sitecustomize that installs guards without requiring hermetic package to be importable.
@@ -16,7 +18,8 @@ from .errors import BootstrapError
 _SITE_CUSTOMIZE = dedent(
     r'''
     # --- BOOTSTRAP START ---
-    import os, sys, json, socket, ssl, subprocess, asyncio, builtins, importlib, importlib.util, importlib.machinery as mach, pathlib, time, errno, atexit, shutil, _imp, zipimport
+    from __future__ import annotations
+    import os, sys, json, functools, socket, ssl, subprocess, asyncio, builtins, importlib, importlib.util, importlib.machinery as mach, pathlib, time, errno, atexit, shutil, threading, _imp, zipimport
 
     class _HPolicy(RuntimeError): pass
 
@@ -43,15 +46,111 @@ _SITE_CUSTOMIZE = dedent(
     _site_dir = os.path.dirname(__file__)
     if os.path.basename(_site_dir).startswith("hermetic_site_"):
         atexit.register(lambda: shutil.rmtree(_site_dir, ignore_errors=True))
+    # Flags are baked into this file, so drop it from PYTHONPATH to keep
+    # grandchild interpreters from inheriting the guards.
+    _pp = [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p and p != _site_dir]
+    if _pp:
+        os.environ["PYTHONPATH"] = os.pathsep.join(_pp)
+    else:
+        os.environ.pop("PYTHONPATH", None)
 
     cfg = json.loads(os.environ.pop("HERMETIC_FLAGS_JSON", "{}"))
 
     trace = bool(cfg.get("trace"))
-    def _tr(msg):
-        if trace:
-            print(f"[hermetic] {msg}", file=sys.stderr, flush=True)
+    def _tr_emit(msg):
+        print(f"[hermetic] {msg}", file=sys.stderr, flush=True)
+    def _tr_noop(msg):
+        pass
+    _tr = _tr_emit if trace else _tr_noop
 
     # --- GUARDS START ---
+    # --- shared network matcher ---
+    _METADATA_HOSTS = frozenset(['100.100.100.200', '169.254.169.254', 'fd00:ec2:0:0:0:0:0:254', 'fd00:ec2::254', 'fe80::a9fe:a9fe', 'metadata', 'metadata.google.internal'])
+    _LOCALHOST = frozenset(['0.0.0.0', '127.0.0.1', '::1', 'localhost'])
+    _BIND_LOOPBACK_LITERALS = frozenset(['127.0.0.1', '::1', 'localhost'])
+    _DNS_TTL = 60.0
+    _DNS_CACHE_MAX = 512
+    _dns_cache = {}
+    _dns_lock = threading.Lock()
+    def _normalize_host(host: str) -> str:
+        """Normalize a hostname for policy checks."""
+        return (host or "").strip().lower().rstrip(".")
+    def _build_allow_trie(domains: Iterable[str]) -> dict[Any, Any]:
+        """Index allowed domains as a trie keyed by reversed DNS labels.
+    
+        A ``None`` key marks a terminal node: the domain itself and every
+        subdomain beneath it are allowed.
+        """
+        trie: dict[Any, Any] = {}
+        for domain in domains:
+            d = _normalize_host(domain)
+            if not d:
+                continue
+            node = trie
+            for label in reversed(d.split(".")):
+                node = node.setdefault(label, {})
+            node[None] = True
+        return trie
+    def _trie_allows(trie: dict[Any, Any], host: str) -> bool:
+        """Check whether a normalized host equals or sits under a trie entry."""
+        node = trie
+        for label in reversed(host.split(".")):
+            child: dict[Any, Any] | None = node.get(label)
+            if child is None:
+                return False
+            if None in child:
+                return True
+            node = child
+        return False
+    def _make_host_matcher(
+        allow_localhost: bool, allow_trie: dict[Any, Any]
+    ) -> Callable[[str], bool]:
+        """Build the memoized allow check for one network policy.
+    
+        The bootstrap embeds this function's source, so the in-process guard
+        and the sitecustomize guard share a single implementation.
+        """
+    
+        @functools.lru_cache(maxsize=1024)
+        def _is_allowed(host: str) -> bool:
+            """Check whether a host is permitted by the network policy."""
+            h = _normalize_host(host)
+            if h in _METADATA_HOSTS:
+                return False
+            if allow_localhost and h in _LOCALHOST:
+                return True
+            return _trie_allows(allow_trie, h)
+    
+        return _is_allowed
+    def _cached_getaddrinfo(
+        cache: dict[Any, tuple[float, Any]],
+        resolve: Callable[..., Any],
+        host: Any,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Call ``resolve`` through a small TTL cache keyed on its arguments.
+    
+        Failures are never cached. Each caller gets its own copy of the result
+        list, so mutating it cannot poison later lookups.
+        """
+        try:
+            key = (host, args, tuple(sorted(kwargs.items())))
+            with _dns_lock:
+                hit = cache.get(key)
+        except TypeError:  # unhashable argument: resolve uncached
+            return resolve(host, *args, **kwargs)
+        now = time.monotonic()
+        if hit is not None and now - hit[0] < _DNS_TTL:
+            return list(hit[1])
+        # Resolve outside the lock so slow lookups do not serialize each other.
+        result = resolve(host, *args, **kwargs)
+        with _dns_lock:
+            if key not in cache and len(cache) >= _DNS_CACHE_MAX:
+                del cache[next(iter(cache))]
+            cache[key] = (now, result)
+        return list(result)
+    
     # --- environment ---
     if cfg.get("no_environment"):
         class _GuardedEnviron:
@@ -175,52 +274,34 @@ _SITE_CUSTOMIZE = dedent(
         if hasattr(socket, "fromshare"):
             _orig_fromshare = socket.fromshare
     
-        ALLOW_LOCAL = bool(cfg.get("allow_localhost"))
-        ALLOW_DOMAINS = set([d.lower() for d in cfg.get("allow_domains", []) if d])
-        META = {
-            "169.254.169.254",
-            "metadata.google.internal",
-            "metadata",
-            "fd00:ec2::254",
-            "fd00:ec2:0:0:0:0:0:254",
-            "fe80::a9fe:a9fe",
-            "100.100.100.200",
-        }
-        LOCAL = {"127.0.0.1","::1","localhost","0.0.0.0"} # nosec
-        BIND_LOOPBACK = {"127.0.0.1","::1","localhost"}
-    
         def _host_from(addr):
             try:
                 if isinstance(addr, (tuple, list)) and len(addr) >= 1: return str(addr[0])
                 return str(addr)
             except Exception: return ""
     
-        def _norm_host(host): return (host or "").strip().lower().rstrip(".")
-        def _domain_match(host, domain):
-            h, d = _norm_host(host), _norm_host(domain)
-            return bool(d) and (h == d or h.endswith("." + d))
-    
-        def _is_net_allowed(host:str)->bool:
-            h = _norm_host(host)
-            if h in META: return False
-            if ALLOW_LOCAL and h in LOCAL: return True
-            return any(_domain_match(h, d) for d in ALLOW_DOMAINS)
+        # _normalize_host, _build_allow_trie, _make_host_matcher and the host
+        # sets are spliced in from this module by scripts/build_bootstrap.py.
+        _is_net_allowed = _make_host_matcher(
+            bool(cfg.get("allow_localhost")),
+            cfg.get("allow_trie") or _build_allow_trie(cfg.get("allow_domains", [])),
+        )
     
         def _bind_allowed(address):
             host = _host_from(address)
-            h = _norm_host(host)
+            h = _normalize_host(host)
             if not h: return False
-            if h in BIND_LOOPBACK: return True
+            if h in _BIND_LOOPBACK_LITERALS: return True
             if h.startswith("127."): return True
             return False
     
         class GuardedSocket(_orig_socket):
             def connect(self, address):
-                host = _host_from(address)
+                host = address[0] if address.__class__ is tuple and address and address[0].__class__ is str else _host_from(address)
                 if _is_net_allowed(host): return super().connect(address)
                 _tr(f"blocked socket.connect host={host}"); raise _HPolicy("network disabled")
             def connect_ex(self, address):
-                host = _host_from(address)
+                host = address[0] if address.__class__ is tuple and address and address[0].__class__ is str else _host_from(address)
                 if _is_net_allowed(host): return super().connect_ex(address)
                 _tr(f"blocked socket.connect_ex host={host}"); return errno.EACCES
             def sendto(self, data, address):
@@ -238,20 +319,20 @@ _SITE_CUSTOMIZE = dedent(
                     _tr(f"blocked socket.sendmsg host={host}"); raise _HPolicy("network disabled")
     
         def _guard_create_connection(addr, *a, **k):
-            host = _host_from(addr)
+            host = addr[0] if addr.__class__ is tuple and addr and addr[0].__class__ is str else _host_from(addr)
             if _is_net_allowed(host): return _orig_create_connection(addr, *a, **k)
             _tr(f"blocked socket.create_connection host={host}"); raise _HPolicy("network disabled")
     
         def _guard_getaddrinfo(host, *a, **k):
-            if _is_net_allowed(str(host)): return _orig_getaddrinfo(host, *a, **k)
+            if _is_net_allowed(host if host.__class__ is str else str(host)): return _cached_getaddrinfo(_dns_cache, _orig_getaddrinfo, host, a, k)
             _tr(f"blocked socket.getaddrinfo host={host}"); raise _HPolicy("network disabled")
     
         def _guard_gethostbyname(host, *a, **k):
-            if _is_net_allowed(str(host)): return _orig_gethostbyname(host, *a, **k)
+            if _is_net_allowed(host if host.__class__ is str else str(host)): return _orig_gethostbyname(host, *a, **k)
             _tr(f"blocked socket.gethostbyname host={host}"); raise _HPolicy("network disabled")
     
         def _guard_gethostbyname_ex(host, *a, **k):
-            if _is_net_allowed(str(host)): return _orig_gethostbyname_ex(host, *a, **k)
+            if _is_net_allowed(host if host.__class__ is str else str(host)): return _orig_gethostbyname_ex(host, *a, **k)
             _tr(f"blocked socket.gethostbyname_ex host={host}"); raise _HPolicy("network disabled")
     
         def _guard_wrap_socket(self, sock, *a, **k):
@@ -322,7 +403,8 @@ _SITE_CUSTOMIZE = dedent(
     # --- fs readonly ---
     if cfg.get("fs_readonly"):
         ROOT = cfg.get("fs_root")
-        import io as _io
+        import io as _io, re as _re
+        _WRITE_MODE_SEARCH = _re.compile(r"[wax+]").search
         _o = {"open": builtins.open, "Path.open": pathlib.Path.open, "os.open": os.open, "io.open": _io.open}
         for _native_mod_name in ("posix", "nt"):
             _native_mod = sys.modules.get(_native_mod_name)
@@ -331,19 +413,25 @@ _SITE_CUSTOMIZE = dedent(
         def _norm(p):
             try: import os as _os; return _os.path.realpath(p)
             except Exception: return p
-        def _within(p, r):
-            if not r: return False
-            P, R = _norm(p), _norm(r)
-            return P==R or P.startswith(R + ("/" if "/" in R else "\\"))
+        ROOT_NORM = _norm(ROOT) if ROOT else None
+        if ROOT_NORM:
+            _sep = "/" if "/" in ROOT_NORM else "\\"
+            ROOT_PREFIX = ROOT_NORM if ROOT_NORM.endswith(_sep) else ROOT_NORM + _sep
+        _orig_open = _o["open"]
+        def _within(p):
+            if not ROOT_NORM: return False
+            P = _norm(p)
+            return P==ROOT_NORM or P.startswith(ROOT_PREFIX)
         def _coerce_path(p):
             try: return str(os.fspath(p))
             except TypeError: return str(p)
         def _open_guard(f, mode="r", *a, **k):
-            path = _coerce_path(f)
             if not isinstance(mode, str): mode = "r"
-            if any(m in mode for m in ("w","a","x","+")): _tr(f"blocked open write path={path}"); raise _HPolicy("fs readonly")
-            if ROOT and not _within(path, ROOT): _tr(f"blocked open read-outside-root path={path}"); raise _HPolicy("read outside root")
-            return _o["open"](f, mode, *a, **k)
+            if _WRITE_MODE_SEARCH(mode) is not None: _tr(f"blocked open write path={_coerce_path(f)}"); raise _HPolicy("fs readonly")
+            if ROOT_NORM:
+                path = _coerce_path(f)
+                if not _within(path): _tr(f"blocked open read-outside-root path={path}"); raise _HPolicy("read outside root")
+            return _orig_open(f, mode, *a, **k)
         WRITE_FLAGS = getattr(os, "O_WRONLY", 2) | getattr(os, "O_RDWR", 4) | getattr(os, "O_APPEND", 8) | getattr(os, "O_CREAT", 1) | getattr(os, "O_TRUNC", 0)
         def os_open_guard(path, flags, *a, **k):
             mode = "r" if not (flags & WRITE_FLAGS) else "w"
@@ -402,9 +490,14 @@ _SITE_CUSTOMIZE = dedent(
         if _BLOCK_PICKLE:
             _DENY |= {"pickle","_pickle","cPickle","marshal","shelve","dill","cloudpickle","jsonpickle"}
         def _deny_native_use(name): raise _HPolicy(f"native interface blocked: {name}")
-        def _match_import(name, denied):
-            root = name.split(".", 1)[0]
-            return name == denied or name.startswith(denied + ".") or root == denied
+        _DENY = frozenset(sys.intern(n) for n in _DENY)
+        def _is_denied(name):
+            if name in _DENY: return True
+            dot = name.find(".")
+            while dot >= 0:
+                if name[:dot] in _DENY: return True
+                dot = name.find(".", dot + 1)
+            return False
         def _absolute_import_names(name, globals_dict=None, fromlist=(), level=0):
             package = ""
             if globals_dict:
@@ -422,7 +515,7 @@ _SITE_CUSTOMIZE = dedent(
             return names
         def _check_names(names):
             for candidate in names:
-                if any(_match_import(candidate, denied) for denied in _DENY):
+                if _is_denied(candidate):
                     _tr(f"blocked import name={candidate}")
                     raise _HPolicy(f"import blocked: {candidate}")
         def _loader_name(loader, module=None):
@@ -476,7 +569,8 @@ _SITE_CUSTOMIZE = dedent(
             _tr(f"blocked native import spec={name}")
             raise _HPolicy(f"native import blocked: {name}")
         def guarded_import(name, globals=None, locals=None, fromlist=(), level=0):
-            _check_names(_absolute_import_names(name, globals, fromlist, level))
+            if level or fromlist: _check_names(_absolute_import_names(name, globals, fromlist, level))
+            elif _is_denied(name): _check_names((name,))
             return _origImp(name, globals, locals, fromlist, level)
         def guarded_import_module(name, package=None):
             absolute = importlib.util.resolve_name(name, package) if name.startswith(".") else name
@@ -566,14 +660,79 @@ _SITE_CUSTOMIZE = dedent(
     '''
 )
 
-def write_sitecustomize(flags: Dict[str, Any]) -> str:
-    '''Write a temporary sitecustomize module that installs bootstrap guards.'''
+# The generic sitecustomize reads its flags from the environment. Files
+# written by write_sitecustomize() replace this line with the flags baked
+# in as a Python literal, so the child skips the JSON parse.
+_CFG_FROM_ENV = 'cfg = json.loads(os.environ.pop("HERMETIC_FLAGS_JSON", "{}"))'
+
+
+def render_sitecustomize(flags: dict[str, Any]) -> str:
+    '''Return sitecustomize source with the given flags baked in as literals.'''
+    baked = dict(flags)
+    if baked.get("no_network") and baked.get("allow_domains"):
+        from .guards.network import _build_allow_trie  # pylint: disable=import-outside-toplevel
+
+        baked["allow_trie"] = _build_allow_trie(baked["allow_domains"])
+    # Fail closed: without the marker the child would run with no baked policy.
+    if _CFG_FROM_ENV not in _SITE_CUSTOMIZE:
+        raise BootstrapError("sitecustomize template lost its config marker line")
+    return _SITE_CUSTOMIZE.replace(_CFG_FROM_ENV, f"cfg = {baked!r}", 1)
+
+
+def _site_cache_root() -> str | None:
+    '''Return a private per-user directory for reusable sitecustomize files.
+
+    Returns None when the directory cannot be trusted (not ours, not a real
+    directory, or writable by others), so callers fall back to a fresh
+    temporary directory rather than executing code someone else planted.
+    '''
+    getuid = getattr(os, "getuid", None)
+    name = f"hermetic-{getuid()}" if getuid is not None else "hermetic"
+    root = os.path.join(tempfile.gettempdir(), name)
     try:
-        d = tempfile.mkdtemp(prefix="hermetic_site_")
+        os.makedirs(root, mode=0o700, exist_ok=True)
+        st = os.lstat(root)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    if getuid and (st.st_uid != getuid() or st.st_mode & 0o077):
+        return None
+    return root
+
+
+def write_sitecustomize(flags: dict[str, Any]) -> str:
+    '''Write (or reuse) a sitecustomize module that installs bootstrap guards.
+
+    The directory is named after a hash of the rendered source, so runs with
+    the same flags and hermetic version share one file instead of writing a
+    new temp directory each time.
+    '''
+    try:
+        source = render_sitecustomize(flags)
+        root = _site_cache_root()
+        if root is None:
+            d = tempfile.mkdtemp(prefix="hermetic_site_")
+        else:
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+            d = os.path.join(root, f"site-{digest}")
         path = os.path.join(d, "sitecustomize.py")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(_SITE_CUSTOMIZE)
-        os.environ["HERMETIC_FLAGS_JSON"] = json.dumps(flags)
+        if os.path.exists(path):
+            return d
+        os.makedirs(d, mode=0o700, exist_ok=True)
+        # Write beside the target and rename, so a concurrent run never
+        # imports a half-written file.
+        fd, tmp_path = tempfile.mkstemp(dir=d, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(source)
+        os.replace(tmp_path, path)
+        # Pre-compile so a child on the same Python version skips parsing
+        # sitecustomize on startup. Other versions ignore the cache tag and
+        # fall back to the .py source.
+        try:
+            py_compile.compile(path, doraise=True)
+        except (py_compile.PyCompileError, OSError):
+            pass
         return d
     except Exception as e:
         raise BootstrapError(f"failed to write sitecustomize: {e}") from e
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 from typing import List
 
@@ -105,10 +106,20 @@ def build_parser() -> argparse.ArgumentParser:
     return p
 
 
+@functools.lru_cache(maxsize=1)
+def _shared_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once per process for internal parsing.
+
+    ``parse_args`` leaves the parser untouched (append defaults are copied),
+    so one instance can serve every call. ``build_parser`` keeps returning
+    fresh parsers for callers that want to customize one.
+    """
+    return build_parser()
+
+
 def parse_hermetic_args(argv: List[str]) -> GuardConfig:
     """Translate CLI flags into a guard configuration."""
-    parser = build_parser()
-    ns = parser.parse_args(argv)
+    ns = _shared_parser().parse_args(argv)
     cfg = GuardConfig(
         no_network=bool(ns.no_network),
         no_subprocess=bool(ns.no_subprocess),
@@ -142,7 +153,7 @@ def main(argv: List[str] | None = None) -> int:
         _ = parse_hermetic_args(split.hermetic_argv)
         # If we reached here without SystemExit, no version/help was triggered.
         # Print help explicitly for UX.
-        build_parser().print_help()
+        _shared_parser().print_help()
         return 0
 
     cfg = parse_hermetic_args(split.hermetic_argv)
@@ -1,42 +1,66 @@
 """Guard module orchestration for bulk install and uninstall operations."""
 
+import importlib
+import sys
 from typing import Any
 
-from . import imports_guard  # nosec
-from . import interpreter  # nosec
-from . import code_exec, environment, filesystem, network, subprocess_guard
-
-# This makes install_all and uninstall_all easily accessible.
-_all_guards = (
-    code_exec,
-    environment,
-    filesystem,
-    imports_guard,
-    interpreter,
-    network,
-    subprocess_guard,
+# Guard submodules are imported lazily: a caller that only blocks
+# subprocesses should not pay for importing ssl, asyncio, and friends.
+_GUARD_MODULE_NAMES = (
+    "code_exec",
+    "environment",
+    "filesystem",
+    "imports_guard",
+    "interpreter",
+    "network",
+    "subprocess_guard",
 )
 
 
+def __getattr__(name: str) -> Any:
+    """Import a guard submodule on first attribute access (PEP 562)."""
+    if name in _GUARD_MODULE_NAMES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def install_all(**kwargs: Any) -> None:
     """Install every requested guard using grouped keyword options."""
+    # pylint: disable=import-outside-toplevel
     if kwargs.get("net"):
+        from . import network
+
         network.install(**kwargs["net"])
     if kwargs.get("subproc"):
+        from . import subprocess_guard
+
         subprocess_guard.install(**kwargs["subproc"])
     if kwargs.get("fs"):
+        from . import filesystem
+
         filesystem.install(**kwargs["fs"])
     if kwargs.get("env"):
+        from . import environment
+
         environment.install(**kwargs["env"])
     if kwargs.get("code"):
+        from . import code_exec
+
         code_exec.install(**kwargs["code"])
     if kwargs.get("imports"):
+        from . import imports_guard  # nosec
+
         imports_guard.install(**kwargs["imports"])
     if kwargs.get("interp"):
+        from . import interpreter  # nosec
+
         interpreter.install(**kwargs["interp"])
 
 
 def uninstall_all() -> None:
     """Remove installed guards in reverse dependency order."""
-    for guard in reversed(_all_guards):
-        guard.uninstall()
+    for name in reversed(_GUARD_MODULE_NAMES):
+        # A guard module that was never imported cannot have been installed.
+        guard = sys.modules.get(f"{__name__}.{name}")
+        if guard is not None:
+            guard.uninstall()
@@ -0,0 +1,20 @@
+"""Trace sinks shared by the guard modules."""
+
+from __future__ import annotations
+
+import sys
+from typing import Callable
+
+
+def emit_trace(msg: str) -> None:
+    """Write a trace line to stderr."""
+    print(f"[hermetic] {msg}", file=sys.stderr, flush=True)
+
+
+def noop_trace(msg: str) -> None:  # pylint: disable=unused-argument
+    """Discard a trace line when tracing is disabled."""
+
+
+def trace_sink(trace: bool) -> Callable[[str], None]:
+    """Pick the sink once at install so blocked calls skip the flag check."""
+    return emit_trace if trace else noop_trace
@@ -7,11 +7,13 @@ import builtins
 import io
 import os
 import pathlib
+import re
 import sys
 from textwrap import dedent
 from typing import Any
 
 from hermetic.errors import PolicyViolation
+from hermetic.guards._trace import trace_sink
 
 _installed = False
 _originals: dict[str, Any] = {}
@@ -29,19 +31,15 @@ _PATH_WRITE_METHODS = (
     "unlink",
 )
 
+# Any of these characters in an open() mode means the file may be written.
+_WRITE_MODE_SEARCH = re.compile(r"[wax+]").search
+
 
 def _norm(path: str) -> str:
     """Resolve a path to its normalized real location."""
     return os.path.realpath(path)
 
 
-def _is_within(path: str, root: str) -> bool:
-    """Check whether a path resolves inside the allowed root."""
-    p = _norm(path)
-    r = _norm(root)
-    return p == r or p.startswith(r + os.sep)
-
-
 def install(*, fs_root: str | None = None, trace: bool = False) -> None:
     """Patch filesystem APIs to deny writes and optional out-of-root reads."""
     global _installed, _root
@@ -50,6 +48,10 @@ def install(*, fs_root: str | None = None, trace: bool = False) -> None:
     _installed, _root = True, fs_root
 
     _originals["open"] = builtins.open
+    orig_open = builtins.open
+    # Resolve the root once; only the opened path needs realpath per call.
+    root_norm = _norm(fs_root) if fs_root else ""
+    root_prefix = root_norm if root_norm.endswith(os.sep) else root_norm + os.sep
     _originals["Path.open"] = pathlib.Path.open
     _originals["os.open"] = os.open
     _originals["io.open"] = io.open
@@ -82,10 +84,14 @@ def install(*, fs_root: str | None = None, trace: bool = False) -> None:
         if hasattr(os, name):
             _originals[f"os.{name}"] = getattr(os, name)
 
-    def _trace(msg: str) -> None:
-        """Emit a trace message when filesystem access is blocked."""
-        if trace:
-            print(f"[hermetic] {msg}", file=sys.stderr, flush=True)
+    _trace = trace_sink(trace)
+
+    def _is_within_root(path: str) -> bool:
+        """Check whether a path resolves inside the allowed root."""
+        # Resolved on every call: the answer depends on the cwd and on what
+        # symlinks point at right now, so it must never be cached.
+        p = _norm(path)
+        return p == root_norm or p.startswith(root_prefix)
 
     def _coerce_path(p: Any) -> str:
         """Convert a path-like input into a printable filesystem path."""
@@ -98,22 +104,27 @@ def install(*, fs_root: str | None = None, trace: bool = False) -> None:
         file: Any, mode: str = "r", *a: Any, **k: Any
     ) -> Any:
         """Allow readonly opens and reject writes or out-of-root reads."""
-        path = _coerce_path(file)
         # mode may be int (numeric flags) when open_guard is reached via
         # os.open; the os_open_guard already translated to a string in that
         # case. Defend anyway.
         mode_str = mode if isinstance(mode, str) else "r"
-        if any(m in mode_str for m in ("w", "a", "x", "+")):
+        if _WRITE_MODE_SEARCH(mode_str) is not None:
+            path = _coerce_path(file)
             _trace(f"blocked open write path={path}")
             raise PolicyViolation(
                 f"filesystem readonly: {path}", guard="filesystem", target=path
             )
-        if _root and not _is_within(path, _root):
-            _trace(f"blocked open read-outside-root path={path}")
-            raise PolicyViolation(
-                f"read outside sandbox root: {path}", guard="filesystem", target=path
-            )
-        return _originals["open"](file, mode, *a, **k)
+        # Without fs_root an allowed read never needs the coerced path.
+        if root_norm:
+            path = _coerce_path(file)
+            if not _is_within_root(path):
+                _trace(f"blocked open read-outside-root path={path}")
+                raise PolicyViolation(
+                    f"read outside sandbox root: {path}",
+                    guard="filesystem",
+                    target=path,
+                )
+        return orig_open(file, mode, *a, **k)
 
     WRITE_FLAGS = (
         os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_TRUNC", 0)
@@ -225,7 +236,8 @@ BOOTSTRAP_CODE = dedent(
 # --- fs readonly ---
 if cfg.get("fs_readonly"):
     ROOT = cfg.get("fs_root")
-    import io as _io
+    import io as _io, re as _re
+    _WRITE_MODE_SEARCH = _re.compile(r"[wax+]").search
     _o = {"open": builtins.open, "Path.open": pathlib.Path.open, "os.open": os.open, "io.open": _io.open}
     for _native_mod_name in ("posix", "nt"):
         _native_mod = sys.modules.get(_native_mod_name)
@@ -234,19 +246,25 @@ if cfg.get("fs_readonly"):
     def _norm(p):
         try: import os as _os; return _os.path.realpath(p)
         except Exception: return p
-    def _within(p, r):
-        if not r: return False
-        P, R = _norm(p), _norm(r)
-        return P==R or P.startswith(R + ("/" if "/" in R else "\\"))
+    ROOT_NORM = _norm(ROOT) if ROOT else None
+    if ROOT_NORM:
+        _sep = "/" if "/" in ROOT_NORM else "\\"
+        ROOT_PREFIX = ROOT_NORM if ROOT_NORM.endswith(_sep) else ROOT_NORM + _sep
+    _orig_open = _o["open"]
+    def _within(p):
+        if not ROOT_NORM: return False
+        P = _norm(p)
+        return P==ROOT_NORM or P.startswith(ROOT_PREFIX)
     def _coerce_path(p):
         try: return str(os.fspath(p))
         except TypeError: return str(p)
     def _open_guard(f, mode="r", *a, **k):
-        path = _coerce_path(f)
         if not isinstance(mode, str): mode = "r"
-        if any(m in mode for m in ("w","a","x","+")): _tr(f"blocked open write path={path}"); raise _HPolicy("fs readonly")
-        if ROOT and not _within(path, ROOT): _tr(f"blocked open read-outside-root path={path}"); raise _HPolicy("read outside root")
-        return _o["open"](f, mode, *a, **k)
+        if _WRITE_MODE_SEARCH(mode) is not None: _tr(f"blocked open write path={_coerce_path(f)}"); raise _HPolicy("fs readonly")
+        if ROOT_NORM:
+            path = _coerce_path(f)
+            if not _within(path): _tr(f"blocked open read-outside-root path={path}"); raise _HPolicy("read outside root")
+        return _orig_open(f, mode, *a, **k)
     WRITE_FLAGS = getattr(os, "O_WRONLY", 2) | getattr(os, "O_RDWR", 4) | getattr(os, "O_APPEND", 8) | getattr(os, "O_CREAT", 1) | getattr(os, "O_TRUNC", 0)
     def os_open_guard(path, flags, *a, **k):
         mode = "r" if not (flags & WRITE_FLAGS) else "w"
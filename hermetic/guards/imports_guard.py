@@ -14,6 +14,7 @@ from textwrap import dedent
 from typing import Any, Iterable
 
 from hermetic.errors import PolicyViolation
+from hermetic.guards._trace import noop_trace, trace_sink
 
 _installed = False
 _originals: dict[str, Any] = {}
@@ -89,6 +90,36 @@ class _NativeExtensionFinder:
         return spec
 
 
+class _GuardedExtLoader(mach.ExtensionFileLoader):
+    """Loader stub that refuses to create native extension modules.
+
+    Defined once at import time; ``install()`` only swaps ``trace_func``.
+    The methods are also grafted onto the original loader class, so they
+    look ``trace_func`` up on this class rather than on ``self``.
+    """
+
+    trace_func: Any = staticmethod(noop_trace)
+
+    def create_module(self, spec: Any) -> Any:
+        """Reject native module creation during import loading."""
+        _GuardedExtLoader.trace_func(f"blocked native import spec={spec.name}")
+        raise PolicyViolation(
+            f"native import blocked: {spec.name}",
+            guard="imports",
+            target=spec.name,
+        )
+
+    def exec_module(self, module: Any) -> Any:
+        """Reject native module execution through a direct loader."""
+        name = _loader_module_name(self, module)
+        _GuardedExtLoader.trace_func(f"blocked native import spec={name}")
+        raise PolicyViolation(
+            f"native import blocked: {name}",
+            guard="imports",
+            target=name,
+        )
+
+
 def _patch_module_attrs(mod_name: str, attrs: tuple[str, ...]) -> None:
     """Replace selected module attributes with policy-raising stand-ins."""
     mod = sys.modules.get(mod_name)
@@ -130,12 +161,21 @@ def _normalize_deny_names(names: Iterable[str]) -> set[str]:
     return {name.strip() for name in names if name and name.strip()}
 
 
-def _matches_denied_import(name: str, denied_name: str) -> bool:
-    """Check whether an import matches a denied module prefix."""
-    root = name.split(".", 1)[0]
-    return (
-        name == denied_name or name.startswith(f"{denied_name}.") or root == denied_name
-    )
+def _is_denied_import(name: str, deny_names: frozenset[str]) -> bool:
+    """Check whether an import or any of its parent packages is denied.
+
+    Equivalent to testing ``name == d or name.startswith(d + ".")`` for
+    every denied ``d``, but costs one set probe per dotted component
+    instead of one string comparison per denied name.
+    """
+    if name in deny_names:
+        return True
+    dot = name.find(".")
+    while dot >= 0:
+        if name[:dot] in deny_names:
+            return True
+        dot = name.find(".", dot + 1)
+    return False
 
 
 def _absolute_import_names(
@@ -211,27 +251,34 @@ def install(
         _originals["_imp.create_dynamic"] = _imp.create_dynamic
         _originals["_imp.exec_dynamic"] = _imp.exec_dynamic
         _originals["sys.meta_path"] = sys.meta_path
-
-    deny_names = _normalize_deny_names(deny_imports)
+    # Bind the originals the hooks call as closure locals: a cell load is
+    # cheaper than a dict subscript on every import.
+    orig_import = _originals["__import__"]
+    orig_import_module = _originals["importlib.import_module"]
+    orig_find_spec = _originals["PathFinder.find_spec_bound"]
+    orig_source_exec = _originals["SourceFileLoader.exec_module"]
+    orig_sourceless_exec = _originals["SourcelessFileLoader.exec_module"]
+    orig_zip_exec = _originals["zipimporter.exec_module"]
+    # Only consulted under block_native, where the original class was saved.
+    ext_loader_type: type[Any] = _originals.get("ExtLoader", mach.ExtensionFileLoader)
+
+    configured_names = _normalize_deny_names(deny_imports)
     if block_native:
-        deny_names |= _DENY_NAMES
+        configured_names |= _DENY_NAMES
     if block_native and block_subprocess_libs:
-        deny_names |= _SUBPROC_REPLACEMENT_NAMES
+        configured_names |= _SUBPROC_REPLACEMENT_NAMES
     if block_pickle:
-        deny_names |= _PICKLE_NAMES
+        configured_names |= _PICKLE_NAMES
+    # Import statements pass interned names, so interning the denied names
+    # lets an exact-name probe match by identity before comparing strings.
+    deny_names = frozenset(sys.intern(n) for n in configured_names)
 
-    def _trace(msg: str) -> None:
-        """Emit a trace message when an import is blocked."""
-        if trace:
-            print(f"[hermetic] {msg}", file=sys.stderr, flush=True)
+    _trace = trace_sink(trace)
 
     def _check_names(names: Iterable[str]) -> None:
         """Raise when any candidate absolute name is denied."""
         for candidate in names:
-            if any(
-                _matches_denied_import(candidate, denied_name)
-                for denied_name in deny_names
-            ):
+            if _is_denied_import(candidate, deny_names):
                 _trace(f"blocked import name={candidate}")
                 raise PolicyViolation(
                     f"import blocked: {candidate}",
@@ -248,12 +295,8 @@ def install(
         """Enforce name and native policy for direct PathFinder use."""
         del cls
         _check_names((fullname,))
-        spec = _originals["PathFinder.find_spec_bound"](fullname, path, target)
-        if (
-            block_native
-            and spec
-            and isinstance(spec.loader, _originals["ExtLoader"])
-        ):
+        spec = orig_find_spec(fullname, path, target)
+        if block_native and spec and isinstance(spec.loader, ext_loader_type):
             _trace(f"blocked native import spec={fullname}")
             raise PolicyViolation(
                 f"native import blocked: {fullname}",
@@ -265,46 +308,26 @@ def install(
     def _guard_source_exec(loader: Any, module: Any) -> Any:
         """Reject denied modules executed through a direct source loader."""
         _check_names((_loader_module_name(loader, module),))
-        return _originals["SourceFileLoader.exec_module"](loader, module)
+        return orig_source_exec(loader, module)
 
     def _guard_sourceless_exec(loader: Any, module: Any) -> Any:
         """Reject denied modules executed through a direct bytecode loader."""
         _check_names((_loader_module_name(loader, module),))
-        return _originals["SourcelessFileLoader.exec_module"](loader, module)
+        return orig_sourceless_exec(loader, module)
 
     def _guard_zip_exec(loader: Any, module: Any) -> Any:
         """Reject denied modules executed through a direct zip loader."""
         _check_names((_loader_module_name(loader, module),))
-        return _originals["zipimporter.exec_module"](loader, module)
+        return orig_zip_exec(loader, module)
 
     if block_native:
         native_finder = _NativeExtensionFinder(
-            ext_loader_type=_originals["ExtLoader"],
+            ext_loader_type=ext_loader_type,
             trace_func=_trace,
         )
         sys.meta_path = [native_finder, *list(sys.meta_path)]
 
-        class GuardedExtLoader(mach.ExtensionFileLoader):
-            """Loader stub that refuses to create native extension modules."""
-
-            def create_module(self, spec: Any) -> Any:
-                """Reject native module creation during import loading."""
-                _trace(f"blocked native import spec={spec.name}")
-                raise PolicyViolation(
-                    f"native import blocked: {spec.name}",
-                    guard="imports",
-                    target=spec.name,
-                )
-
-            def exec_module(self, module: Any) -> Any:
-                """Reject native module execution through a direct loader."""
-                name = _loader_module_name(self, module)
-                _trace(f"blocked native import spec={name}")
-                raise PolicyViolation(
-                    f"native import blocked: {name}",
-                    guard="imports",
-                    target=name,
-                )
+        _GuardedExtLoader.trace_func = staticmethod(_trace)
 
         def _deny_dynamic(spec_or_module: Any, *args: Any, **kwargs: Any) -> Any:
             """Reject direct use of CPython's native-module loader hooks."""
@@ -328,8 +351,14 @@ def install(
         level: int = 0,
     ) -> Any:
         """Reject denied imports before delegating to Python's importer."""
-        _check_names(_absolute_import_names(name, globals, fromlist, level))
-        return _originals["__import__"](name, globals, locals, fromlist, level)
+        # This hook stays on builtins.__import__ rather than sys.meta_path:
+        # a finder is never consulted for modules already in sys.modules,
+        # so it could not deny e.g. a pickle imported before install().
+        if level or fromlist:
+            _check_names(_absolute_import_names(name, globals, fromlist, level))
+        elif _is_denied_import(name, deny_names):
+            _check_names((name,))
+        return orig_import(name, globals, locals, fromlist, level)
 
     def guarded_import_module(name: str, package: str | None = None) -> Any:
         """Reject denied imports through ``importlib.import_module``."""
@@ -337,16 +366,16 @@ def install(
             importlib.util.resolve_name(name, package) if name.startswith(".") else name
         )
         _check_names((absolute,))
-        return _originals["importlib.import_module"](name, package)
+        return orig_import_module(name, package)
 
     mach.PathFinder.find_spec = classmethod(_guard_pathfinder_find_spec)  # type: ignore[method-assign,assignment]
     mach.SourceFileLoader.exec_module = _guard_source_exec  # type: ignore[method-assign,assignment]
     mach.SourcelessFileLoader.exec_module = _guard_sourceless_exec  # type: ignore[method-assign,assignment]
     zipimport.zipimporter.exec_module = _guard_zip_exec  # type: ignore[method-assign,assignment]
     if block_native:
-        mach.ExtensionFileLoader = GuardedExtLoader  # type: ignore[misc]
-        _originals["ExtLoader"].create_module = GuardedExtLoader.create_module
-        _originals["ExtLoader"].exec_module = GuardedExtLoader.exec_module
+        mach.ExtensionFileLoader = _GuardedExtLoader  # type: ignore[misc]
+        _originals["ExtLoader"].create_module = _GuardedExtLoader.create_module
+        _originals["ExtLoader"].exec_module = _GuardedExtLoader.exec_module
         _imp.create_dynamic = _deny_dynamic
         _imp.exec_dynamic = _deny_dynamic
     builtins.__import__ = guarded_import
@@ -378,6 +407,7 @@ def uninstall() -> None:
             "ExtensionFileLoader.exec_module"
         )
         mach.ExtensionFileLoader = original_ext_loader  # type: ignore[misc]
+        _GuardedExtLoader.trace_func = staticmethod(noop_trace)
         _imp.create_dynamic = _originals.pop("_imp.create_dynamic")
         _imp.exec_dynamic = _originals.pop("_imp.exec_dynamic")
     builtins.__import__ = _originals.pop("__import__")
@@ -425,9 +455,14 @@ if cfg.get("block_native") or cfg.get("deny_imports") or cfg.get("no_code_exec")
     if _BLOCK_PICKLE:
         _DENY |= {"pickle","_pickle","cPickle","marshal","shelve","dill","cloudpickle","jsonpickle"}
     def _deny_native_use(name): raise _HPolicy(f"native interface blocked: {name}")
-    def _match_import(name, denied):
-        root = name.split(".", 1)[0]
-        return name == denied or name.startswith(denied + ".") or root == denied
+    _DENY = frozenset(sys.intern(n) for n in _DENY)
+    def _is_denied(name):
+        if name in _DENY: return True
+        dot = name.find(".")
+        while dot >= 0:
+            if name[:dot] in _DENY: return True
+            dot = name.find(".", dot + 1)
+        return False
     def _absolute_import_names(name, globals_dict=None, fromlist=(), level=0):
         package = ""
         if globals_dict:
@@ -445,7 +480,7 @@ if cfg.get("block_native") or cfg.get("deny_imports") or cfg.get("no_code_exec")
         return names
     def _check_names(names):
         for candidate in names:
-            if any(_match_import(candidate, denied) for denied in _DENY):
+            if _is_denied(candidate):
                 _tr(f"blocked import name={candidate}")
                 raise _HPolicy(f"import blocked: {candidate}")
     def _loader_name(loader, module=None):
@@ -499,7 +534,8 @@ if cfg.get("block_native") or cfg.get("deny_imports") or cfg.get("no_code_exec")
         _tr(f"blocked native import spec={name}")
         raise _HPolicy(f"native import blocked: {name}")
     def guarded_import(name, globals=None, locals=None, fromlist=(), level=0):
-        _check_names(_absolute_import_names(name, globals, fromlist, level))
+        if level or fromlist: _check_names(_absolute_import_names(name, globals, fromlist, level))
+        elif _is_denied(name): _check_names((name,))
         return _origImp(name, globals, locals, fromlist, level)
     def guarded_import_module(name, package=None):
         absolute = importlib.util.resolve_name(name, package) if name.startswith(".") else name
@@ -4,39 +4,57 @@
 from __future__ import annotations
 
 import errno
+import functools
 import socket
-import ssl
-import sys
+import threading
+import time
 from textwrap import dedent
-from typing import Any, Iterable, Set
+from typing import Any, Callable, Iterable
 
 from hermetic.errors import PolicyViolation
+from hermetic.guards._trace import trace_sink
 
 # State
 _originals: dict[str, Any] = {}
 _installed = False
+# Memoized policy decision for the active install; cleared on uninstall so
+# decisions never leak across install/uninstall cycles.
+_is_allowed_cached: Callable[[str], bool] | None = None
 
 # Deny well-known cloud metadata endpoints even if DNS allowed.
 # IPv6 forms and link-local SLAAC variants included — AWS IMDSv2 supports
 # IPv6 at fd00:ec2::254; the IPv4 metadata IP also has an IPv6-mapped form.
-_METADATA_HOSTS: Set[str] = {
-    "169.254.169.254",  # AWS/Azure/OpenStack/DigitalOcean metadata
-    "metadata.google.internal",  # GCP
-    "metadata",  # short-form GCP alias when search-domain matches
-    "fd00:ec2::254",  # AWS IMDSv2 IPv6
-    "fd00:ec2:0:0:0:0:0:254",
-    "fe80::a9fe:a9fe",  # link-local SLAAC variant
-    "100.100.100.200",  # Alibaba Cloud metadata
-}
-
-_LOCALHOST = {"127.0.0.1", "::1", "localhost", "0.0.0.0"}  # nosec
+_METADATA_HOSTS: frozenset[str] = frozenset(
+    {
+        "169.254.169.254",  # AWS/Azure/OpenStack/DigitalOcean metadata
+        "metadata.google.internal",  # GCP
+        "metadata",  # short-form GCP alias when search-domain matches
+        "fd00:ec2::254",  # AWS IMDSv2 IPv6
+        "fd00:ec2:0:0:0:0:0:254",
+        "fe80::a9fe:a9fe",  # link-local SLAAC variant
+        "100.100.100.200",  # Alibaba Cloud metadata
+    }
+)
+
+_LOCALHOST: frozenset[str] = frozenset(
+    {"127.0.0.1", "::1", "localhost", "0.0.0.0"}  # nosec
+)
 
 # Strict loopback set for bind(): does NOT include wildcard addresses.
 # 0.0.0.0 and :: (and the empty-string idiom) bind to *every* interface,
 # which would let an attacker accept inbound connections on a real NIC
 # and exfiltrate by waiting for a peer to dial in. The 127.0.0.0/8 range
 # is loopback-only on every modern OS; we accept any address in it.
-_BIND_LOOPBACK_LITERALS = {"127.0.0.1", "::1", "localhost"}
+_BIND_LOOPBACK_LITERALS: frozenset[str] = frozenset({"127.0.0.1", "::1", "localhost"})
+
+# Resolutions of allowed hosts are reused for a short while so repeated
+# requests to the same host skip the DNS round-trip.
+_DNS_TTL = 60.0
+_DNS_CACHE_MAX = 512
+_dns_cache: dict[Any, tuple[float, Any]] = {}
+# Guards lookups, eviction and inserts; two threads evicting at once could
+# otherwise both pick the same oldest key and one pop() would raise.
+_dns_lock = threading.Lock()
 
 
 def _normalize_host(host: str) -> str:
@@ -44,23 +62,101 @@ def _normalize_host(host: str) -> str:
     return (host or "").strip().lower().rstrip(".")
 
 
-def _domain_matches(host: str, domain: str) -> bool:
-    """Check whether a host is equal to or inside an allowed domain."""
-    h = _normalize_host(host)
-    d = _normalize_host(domain)
-    return bool(d) and (h == d or h.endswith(f".{d}"))
+def _build_allow_trie(domains: Iterable[str]) -> dict[Any, Any]:
+    """Index allowed domains as a trie keyed by reversed DNS labels.
+
+    A ``None`` key marks a terminal node: the domain itself and every
+    subdomain beneath it are allowed.
+    """
+    trie: dict[Any, Any] = {}
+    for domain in domains:
+        d = _normalize_host(domain)
+        if not d:
+            continue
+        node = trie
+        for label in reversed(d.split(".")):
+            node = node.setdefault(label, {})
+        node[None] = True
+    return trie
+
+
+def _trie_allows(trie: dict[Any, Any], host: str) -> bool:
+    """Check whether a normalized host equals or sits under a trie entry."""
+    node = trie
+    for label in reversed(host.split(".")):
+        child: dict[Any, Any] | None = node.get(label)
+        if child is None:
+            return False
+        if None in child:
+            return True
+        node = child
+    return False
+
+
+def _make_host_matcher(
+    allow_localhost: bool, allow_trie: dict[Any, Any]
+) -> Callable[[str], bool]:
+    """Build the memoized allow check for one network policy.
+
+    The bootstrap embeds this function's source, so the in-process guard
+    and the sitecustomize guard share a single implementation.
+    """
+
+    @functools.lru_cache(maxsize=1024)
+    def _is_allowed(host: str) -> bool:
+        """Check whether a host is permitted by the network policy."""
+        h = _normalize_host(host)
+        if h in _METADATA_HOSTS:
+            return False
+        if allow_localhost and h in _LOCALHOST:
+            return True
+        return _trie_allows(allow_trie, h)
+
+    return _is_allowed
+
+
+def _cached_getaddrinfo(
+    cache: dict[Any, tuple[float, Any]],
+    resolve: Callable[..., Any],
+    host: Any,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    """Call ``resolve`` through a small TTL cache keyed on its arguments.
+
+    Failures are never cached. Each caller gets its own copy of the result
+    list, so mutating it cannot poison later lookups.
+    """
+    try:
+        key = (host, args, tuple(sorted(kwargs.items())))
+        with _dns_lock:
+            hit = cache.get(key)
+    except TypeError:  # unhashable argument: resolve uncached
+        return resolve(host, *args, **kwargs)
+    now = time.monotonic()
+    if hit is not None and now - hit[0] < _DNS_TTL:
+        return list(hit[1])
+    # Resolve outside the lock so slow lookups do not serialize each other.
+    result = resolve(host, *args, **kwargs)
+    with _dns_lock:
+        if key not in cache and len(cache) >= _DNS_CACHE_MAX:
+            del cache[next(iter(cache))]
+        cache[key] = (now, result)
+    return list(result)
 
 
 def install(
     *, allow_localhost: bool, allow_domains: Iterable[str], trace: bool = False
 ) -> None:
     """Patch networking APIs while keeping `socket.socket` subclassable."""
-    global _installed
+    global _installed, _is_allowed_cached
     if _installed:
         return
     _installed = True
 
-    allowed = {d.lower().strip() for d in allow_domains if d}
+    import ssl  # pylint: disable=import-outside-toplevel
+
+    allow_trie = _build_allow_trie(allow_domains)
 
     # Save originals
     _originals["socket_cls"] = socket.socket
@@ -77,10 +173,7 @@ def install(
     if hasattr(socket, "fromshare"):
         _originals["fromshare"] = socket.fromshare
 
-    def _trace(msg: str) -> None:
-        """Emit a trace message when network access is blocked."""
-        if trace:
-            print(f"[hermetic] {msg}", file=sys.stderr, flush=True)
+    _trace = trace_sink(trace)
 
     def _host_from(addr: Any) -> str:
         """Extract the host component from a socket-style address."""
@@ -91,14 +184,13 @@ def install(
         except Exception:
             return ""
 
-    def _is_allowed(host: str) -> bool:
-        """Check whether a host is permitted by the current network policy."""
-        h = _normalize_host(host)
-        if h in _METADATA_HOSTS:
-            return False
-        if allow_localhost and h in _LOCALHOST:
-            return True
-        return any(_domain_matches(h, d) for d in allowed)
+    _is_allowed = _make_host_matcher(allow_localhost, allow_trie)
+    # Closure locals avoid a dict subscript on every allowed call.
+    orig_create_connection = _originals["create_connection"]
+    orig_getaddrinfo = _originals["getaddrinfo"]
+    orig_gethostbyname = _originals["gethostbyname"]
+    orig_gethostbyname_ex = _originals["gethostbyname_ex"]
+    _is_allowed_cached = _is_allowed
 
     def _bind_allowed(address: Any) -> bool:
         """Allow only loopback-style bind targets."""
@@ -127,7 +219,12 @@ def install(
 
         def connect(self, address: Any) -> Any:
             """Permit allowed outbound connections and reject the rest."""
-            host = _host_from(address)
+            # Fast path for the common (host, port) tuple; anything unusual
+            # goes through the defensive _host_from.
+            if address.__class__ is tuple and address and address[0].__class__ is str:
+                host = address[0]
+            else:
+                host = _host_from(address)
             if _is_allowed(host):
                 return super().connect(address)
             _trace(f"blocked socket.connect host={host} reason=no-network")
@@ -137,7 +234,10 @@ def install(
 
         def connect_ex(self, address: Any) -> int:
             """Mirror `connect_ex` while denying disallowed destinations."""
-            host = _host_from(address)
+            if address.__class__ is tuple and address and address[0].__class__ is str:
+                host = address[0]
+            else:
+                host = _host_from(address)
             if _is_allowed(host):
                 return int(super().connect_ex(address))
             _trace(f"blocked socket.connect_ex host={host} reason=no-network")
@@ -183,9 +283,12 @@ def install(
 
     def create_connection_guard(address: Any, *a: Any, **k: Any) -> Any:
         """Guard `socket.create_connection` with the active network policy."""
-        host = _host_from(address)
+        if address.__class__ is tuple and address and address[0].__class__ is str:
+            host = address[0]
+        else:
+            host = _host_from(address)
         if _is_allowed(host):
-            return _originals["create_connection"](address, *a, **k)
+            return orig_create_connection(address, *a, **k)
         _trace(f"blocked socket.create_connection host={host} reason=no-network")
         raise PolicyViolation(
             f"network disabled: create_connection({host})", guard="network", target=host
@@ -193,8 +296,8 @@ def install(
 
     def getaddrinfo_guard(host: Any, *a: Any, **k: Any) -> Any:
         """Guard DNS resolution through `socket.getaddrinfo`."""
-        if _is_allowed(str(host)):
-            return _originals["getaddrinfo"](host, *a, **k)
+        if _is_allowed(host if host.__class__ is str else str(host)):
+            return _cached_getaddrinfo(_dns_cache, orig_getaddrinfo, host, a, k)
         _trace(f"blocked socket.getaddrinfo host={host} reason=no-network")
         raise PolicyViolation(
             f"network disabled: DNS({host})", guard="network", target=str(host)
@@ -202,8 +305,8 @@ def install(
 
     def gethostbyname_guard(host: Any, *a: Any, **k: Any) -> Any:
         """Guard `socket.gethostbyname` lookups."""
-        if _is_allowed(str(host)):
-            return _originals["gethostbyname"](host, *a, **k)
+        if _is_allowed(host if host.__class__ is str else str(host)):
+            return orig_gethostbyname(host, *a, **k)
         _trace(f"blocked socket.gethostbyname host={host} reason=no-network")
         raise PolicyViolation(
             f"network disabled: DNS({host})", guard="network", target=str(host)
@@ -211,8 +314,8 @@ def install(
 
     def gethostbyname_ex_guard(host: Any, *a: Any, **k: Any) -> Any:
         """Guard `socket.gethostbyname_ex` lookups."""
-        if _is_allowed(str(host)):
-            return _originals["gethostbyname_ex"](host, *a, **k)
+        if _is_allowed(host if host.__class__ is str else str(host)):
+            return orig_gethostbyname_ex(host, *a, **k)
         _trace(f"blocked socket.gethostbyname_ex host={host} reason=no-network")
         raise PolicyViolation(
             f"network disabled: DNS({host})", guard="network", target=str(host)
@@ -275,9 +378,16 @@ def install(
 
 def uninstall() -> None:
     """Restore the original networking APIs."""
-    global _installed
+    global _installed, _is_allowed_cached
     if not _installed:
         return
+    if _is_allowed_cached is not None:
+        _is_allowed_cached.cache_clear()  # type: ignore[attr-defined]
+        _is_allowed_cached = None
+    with _dns_lock:
+        _dns_cache.clear()
+    import ssl  # pylint: disable=import-outside-toplevel
+
     socket.socket = _originals["socket_cls"]  # type: ignore[misc]
     if _originals.get("SocketType") is not None:
         socket.SocketType = _originals["SocketType"]
@@ -315,52 +425,34 @@ if cfg.get("no_network"):
     if hasattr(socket, "fromshare"):
         _orig_fromshare = socket.fromshare
 
-    ALLOW_LOCAL = bool(cfg.get("allow_localhost"))
-    ALLOW_DOMAINS = set([d.lower() for d in cfg.get("allow_domains", []) if d])
-    META = {
-        "169.254.169.254",
-        "metadata.google.internal",
-        "metadata",
-        "fd00:ec2::254",
-        "fd00:ec2:0:0:0:0:0:254",
-        "fe80::a9fe:a9fe",
-        "100.100.100.200",
-    }
-    LOCAL = {"127.0.0.1","::1","localhost","0.0.0.0"} # nosec
-    BIND_LOOPBACK = {"127.0.0.1","::1","localhost"}
-
     def _host_from(addr):
         try:
             if isinstance(addr, (tuple, list)) and len(addr) >= 1: return str(addr[0])
             return str(addr)
         except Exception: return ""
 
-    def _norm_host(host): return (host or "").strip().lower().rstrip(".")
-    def _domain_match(host, domain):
-        h, d = _norm_host(host), _norm_host(domain)
-        return bool(d) and (h == d or h.endswith("." + d))
-
-    def _is_net_allowed(host:str)->bool:
-        h = _norm_host(host)
-        if h in META: return False
-        if ALLOW_LOCAL and h in LOCAL: return True
-        return any(_domain_match(h, d) for d in ALLOW_DOMAINS)
+    # _normalize_host, _build_allow_trie, _make_host_matcher and the host
+    # sets are spliced in from this module by scripts/build_bootstrap.py.
+    _is_net_allowed = _make_host_matcher(
+        bool(cfg.get("allow_localhost")),
+        cfg.get("allow_trie") or _build_allow_trie(cfg.get("allow_domains", [])),
+    )
 
     def _bind_allowed(address):
         host = _host_from(address)
-        h = _norm_host(host)
+        h = _normalize_host(host)
         if not h: return False
-        if h in BIND_LOOPBACK: return True
+        if h in _BIND_LOOPBACK_LITERALS: return True
         if h.startswith("127."): return True
         return False
 
     class GuardedSocket(_orig_socket):
         def connect(self, address):
-            host = _host_from(address)
+            host = address[0] if address.__class__ is tuple and address and address[0].__class__ is str else _host_from(address)
             if _is_net_allowed(host): return super().connect(address)
             _tr(f"blocked socket.connect host={host}"); raise _HPolicy("network disabled")
         def connect_ex(self, address):
-            host = _host_from(address)
+            host = address[0] if address.__class__ is tuple and address and address[0].__class__ is str else _host_from(address)
             if _is_net_allowed(host): return super().connect_ex(address)
             _tr(f"blocked socket.connect_ex host={host}"); return errno.EACCES
         def sendto(self, data, address):
@@ -378,20 +470,20 @@ if cfg.get("no_network"):
                 _tr(f"blocked socket.sendmsg host={host}"); raise _HPolicy("network disabled")
 
     def _guard_create_connection(addr, *a, **k):
-        host = _host_from(addr)
+        host = addr[0] if addr.__class__ is tuple and addr and addr[0].__class__ is str else _host_from(addr)
         if _is_net_allowed(host): return _orig_create_connection(addr, *a, **k)
         _tr(f"blocked socket.create_connection host={host}"); raise _HPolicy("network disabled")
 
     def _guard_getaddrinfo(host, *a, **k):
-        if _is_net_allowed(str(host)): return _orig_getaddrinfo(host, *a, **k)
+        if _is_net_allowed(host if host.__class__ is str else str(host)): return _cached_getaddrinfo(_dns_cache, _orig_getaddrinfo, host, a, k)
         _tr(f"blocked socket.getaddrinfo host={host}"); raise _HPolicy("network disabled")
 
     def _guard_gethostbyname(host, *a, **k):
-        if _is_net_allowed(str(host)): return _orig_gethostbyname(host, *a, **k)
+        if _is_net_allowed(host if host.__class__ is str else str(host)): return _orig_gethostbyname(host, *a, **k)
         _tr(f"blocked socket.gethostbyname host={host}"); raise _HPolicy("network disabled")
 
     def _guard_gethostbyname_ex(host, *a, **k):
-        if _is_net_allowed(str(host)): return _orig_gethostbyname_ex(host, *a, **k)
+        if _is_net_allowed(host if host.__class__ is str else str(host)): return _orig_gethostbyname_ex(host, *a, **k)
         _tr(f"blocked socket.gethostbyname_ex host={host}"); raise _HPolicy("network disabled")
 
     def _guard_wrap_socket(self, sock, *a, **k):
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import os
 import subprocess  # nosec
 import sys
@@ -28,6 +27,9 @@ def install(*, trace: bool = False) -> None:
         return
     _installed = True
 
+    # asyncio is heavy to import; only pay for it when the guard is used.
+    import asyncio  # pylint: disable=import-outside-toplevel
+
     targets: dict[Any, tuple[str, ...]] = {
         subprocess: (
             "Popen",
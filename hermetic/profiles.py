@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List
+import functools
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, List
 
+from hermetic.util import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class GuardConfig:
     """Capture the guard settings used to run a target.
 
@@ -74,18 +77,34 @@ PROFILES: dict[str, GuardConfig] = {
 }
 
 
-def apply_profile(base: GuardConfig, name: str) -> GuardConfig:
-    """Overlay a named profile onto an existing guard config."""
+@functools.cache
+def _profile_overrides(name: str) -> tuple[tuple[str, Any], ...]:
+    """Return the truthy fields a named profile sets, computed once per name.
+
+    ``PROFILES`` is static, so the result is cached; list values are frozen
+    to tuples so the cached entry cannot be mutated through a caller.
+    """
     prof = PROFILES.get(name)
     if not prof:
         raise SystemExit(f"unknown profile: {name}")
-    # Merge 'truthy' fields from profile into base.
-    merged = GuardConfig(**vars(base))
-    for k, v in vars(prof).items():
+    overrides: list[tuple[str, Any]] = []
+    for f in fields(prof):
+        v = getattr(prof, f.name)
         if isinstance(v, bool) and v:
-            setattr(merged, k, True)
+            overrides.append((f.name, True))
         elif isinstance(v, list) and v:
-            getattr(merged, k).extend(v)
+            overrides.append((f.name, tuple(v)))
         elif isinstance(v, str) and v:
-            setattr(merged, k, v)
-    return merged
+            overrides.append((f.name, v))
+    return tuple(overrides)
+
+
+def apply_profile(base: GuardConfig, name: str) -> GuardConfig:
+    """Overlay a named profile onto an existing guard config."""
+    # Merge 'truthy' fields from profile into base; lists are extended into
+    # fresh lists so ``base`` is never mutated.
+    changes: dict[str, Any] = {
+        k: [*getattr(base, k), *v] if isinstance(v, tuple) else v
+        for k, v in _profile_overrides(name)
+    }
+    return replace(base, **changes)
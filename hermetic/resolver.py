@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import importlib
 import importlib.metadata
 import os
@@ -9,14 +10,14 @@ import re
 import runpy
 import sys
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Iterable, Optional
 
-from hermetic.util import which
+from hermetic.util import DATACLASS_SLOTS, which
 
 SHEBANG_RE = re.compile(r"^#!\s*(\S+)(?:\s+.*)?$")
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TargetSpec:
     """Describe how hermetic should launch a requested target."""
 
@@ -27,22 +28,34 @@ class TargetSpec:
     interp_path: Optional[str] = None
 
 
-def _console_entry(name: str) -> Optional[Tuple[str, str]]:
-    """Resolve a console script name to its module and attribute."""
+@functools.cache
+def _console_entries() -> dict[str, tuple[str, str]]:
+    """Map every installed console script name to its module and attribute.
+
+    Scanning distribution metadata is slow on a large environment, so the
+    map is built once per process.
+    """
     eps = importlib.metadata.entry_points()
     group: Iterable[importlib.metadata.EntryPoint]
     try:
         group = eps.select(group="console_scripts")
     except Exception:
         group = [e for e in eps if getattr(e, "group", None) == "console_scripts"]
+    entries: dict[str, tuple[str, str]] = {}
     for ep in group:
-        if ep.name == name:
-            if ":" in ep.value:
-                m, a = ep.value.split(":", 1)
-            else:
-                m, a = ep.value, "__main__"
-            return m, a
-    return None
+        if ep.name in entries:
+            continue
+        if ":" in ep.value:
+            m, a = ep.value.split(":", 1)
+        else:
+            m, a = ep.value, "__main__"
+        entries[ep.name] = (m, a)
+    return entries
+
+
+def _console_entry(name: str) -> Optional[tuple[str, str]]:
+    """Resolve a console script name to its module and attribute."""
+    return _console_entries().get(name)
 
 
 def _script_shebang(exe: str) -> Optional[str]:
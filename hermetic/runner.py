@@ -64,8 +64,10 @@ def run(target: str, target_argv: List[str], cfg: GuardConfig) -> int:
                 print(f"hermetic: command not found: {spec.exe_path}", file=sys.stderr)
                 return 127  # Standard exit code for "command not found"
             finally:
-                # Cleanup temporary site directory on Windows since we waited.
-                shutil.rmtree(site_dir, ignore_errors=True)
+                # Cleanup a one-off temporary site directory on Windows since
+                # we waited; content-addressed cache directories are reused.
+                if os.path.basename(site_dir).startswith("hermetic_site_"):
+                    shutil.rmtree(site_dir, ignore_errors=True)
         else:
             # On Unix-like systems, replace the current process for a seamless handoff.
             # This is the original, desired behavior for Linux/macOS.
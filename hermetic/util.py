@@ -6,10 +6,15 @@ import os
 import shutil
 import sys
 from dataclasses import dataclass
-from typing import List
+from typing import Any, List
 
+# Keyword arguments for @dataclass on the small value types built per call
+# (configs, specs, argv splits). slots=True drops the per-instance __dict__
+# but only exists on Python 3.10+; older interpreters get plain dataclasses.
+DATACLASS_SLOTS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class SplitArgs:
     """Hold the separated hermetic and target argument vectors."""
 
@@ -17,16 +22,21 @@ class SplitArgs:
     target_argv: List[str]
 
 
-_HELP_TOKENS = {"-h", "--help", "--version"}
+_HELP_TOKENS = frozenset({"-h", "--help", "--version"})
 
 
 def split_argv(argv: list[str]) -> SplitArgs:
     """Split CLI arguments into hermetic flags and target arguments."""
-    if "--" in argv:
+    # One C-level scan for the separator instead of a membership test
+    # followed by a second scan for its index.
+    try:
         idx = argv.index("--")
+    except ValueError:
+        pass
+    else:
         return SplitArgs(argv[:idx], argv[idx + 1 :])
 
-    if any(tok in argv for tok in _HELP_TOKENS):
+    if not _HELP_TOKENS.isdisjoint(argv):
         return SplitArgs(argv, [])
 
     raise SystemExit("usage error: separate hermetic and target args with `--`")
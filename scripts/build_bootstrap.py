@@ -11,6 +11,7 @@ in sync with the guard modules, which are the single source of truth.
 
 To run: `python scripts/build_bootstrap.py` from the project root.
 """
+import inspect
 import os
 import sys
 
@@ -31,11 +32,13 @@ BOOTSTRAP_PY_TEMPLATE = r"""# hermetic/bootstrap.py
 '''Bootstrap helpers for installing guards in a foreign interpreter.'''
 
 from __future__ import annotations
-import json
+import hashlib
 import os
+import py_compile
+import stat
 import tempfile
 from textwrap import dedent
-from typing import Dict, Any
+from typing import Any
 from .errors import BootstrapError
 
 # Minimal bootstrap sitecustomize that installs guards without requiring hermetic package to be importable.
@@ -44,7 +47,8 @@ from .errors import BootstrapError
 _SITE_CUSTOMIZE = dedent(
     r'''
     # --- BOOTSTRAP START ---
-    import os, sys, json, socket, ssl, subprocess, asyncio, builtins, importlib, importlib.util, importlib.machinery as mach, pathlib, time, errno, atexit, shutil, _imp, zipimport
+    from __future__ import annotations
+    import os, sys, json, functools, socket, ssl, subprocess, asyncio, builtins, importlib, importlib.util, importlib.machinery as mach, pathlib, time, errno, atexit, shutil, threading, _imp, zipimport
 
     class _HPolicy(RuntimeError): pass
 
@@ -71,13 +75,22 @@ _SITE_CUSTOMIZE = dedent(
     _site_dir = os.path.dirname(__file__)
     if os.path.basename(_site_dir).startswith("hermetic_site_"):
         atexit.register(lambda: shutil.rmtree(_site_dir, ignore_errors=True))
+    # Flags are baked into this file, so drop it from PYTHONPATH to keep
+    # grandchild interpreters from inheriting the guards.
+    _pp = [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p and p != _site_dir]
+    if _pp:
+        os.environ["PYTHONPATH"] = os.pathsep.join(_pp)
+    else:
+        os.environ.pop("PYTHONPATH", None)
 
     cfg = json.loads(os.environ.pop("HERMETIC_FLAGS_JSON", "{{}}"))
 
     trace = bool(cfg.get("trace"))
-    def _tr(msg):
-        if trace:
-            print(f"[hermetic] {{msg}}", file=sys.stderr, flush=True)
+    def _tr_emit(msg):
+        print(f"[hermetic] {{msg}}", file=sys.stderr, flush=True)
+    def _tr_noop(msg):
+        pass
+    _tr = _tr_emit if trace else _tr_noop
 
     # --- GUARDS START ---
 {guards_code}
@@ -86,20 +99,119 @@ _SITE_CUSTOMIZE = dedent(
     '''
 )
 
-def write_sitecustomize(flags: Dict[str, Any]) -> str:
-    '''Write a temporary sitecustomize module that installs bootstrap guards.'''
+# The generic sitecustomize reads its flags from the environment. Files
+# written by write_sitecustomize() replace this line with the flags baked
+# in as a Python literal, so the child skips the JSON parse.
+_CFG_FROM_ENV = 'cfg = json.loads(os.environ.pop("HERMETIC_FLAGS_JSON", "{{}}"))'
+
+
+def render_sitecustomize(flags: dict[str, Any]) -> str:
+    '''Return sitecustomize source with the given flags baked in as literals.'''
+    baked = dict(flags)
+    if baked.get("no_network") and baked.get("allow_domains"):
+        from .guards.network import _build_allow_trie  # pylint: disable=import-outside-toplevel
+
+        baked["allow_trie"] = _build_allow_trie(baked["allow_domains"])
+    # Fail closed: without the marker the child would run with no baked policy.
+    if _CFG_FROM_ENV not in _SITE_CUSTOMIZE:
+        raise BootstrapError("sitecustomize template lost its config marker line")
+    return _SITE_CUSTOMIZE.replace(_CFG_FROM_ENV, f"cfg = {{baked!r}}", 1)
+
+
+def _site_cache_root() -> str | None:
+    '''Return a private per-user directory for reusable sitecustomize files.
+
+    Returns None when the directory cannot be trusted (not ours, not a real
+    directory, or writable by others), so callers fall back to a fresh
+    temporary directory rather than executing code someone else planted.
+    '''
+    getuid = getattr(os, "getuid", None)
+    name = f"hermetic-{{getuid()}}" if getuid is not None else "hermetic"
+    root = os.path.join(tempfile.gettempdir(), name)
+    try:
+        os.makedirs(root, mode=0o700, exist_ok=True)
+        st = os.lstat(root)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    if getuid and (st.st_uid != getuid() or st.st_mode & 0o077):
+        return None
+    return root
+
+
+def write_sitecustomize(flags: dict[str, Any]) -> str:
+    '''Write (or reuse) a sitecustomize module that installs bootstrap guards.
+
+    The directory is named after a hash of the rendered source, so runs with
+    the same flags and hermetic version share one file instead of writing a
+    new temp directory each time.
+    '''
     try:
-        d = tempfile.mkdtemp(prefix="hermetic_site_")
+        source = render_sitecustomize(flags)
+        root = _site_cache_root()
+        if root is None:
+            d = tempfile.mkdtemp(prefix="hermetic_site_")
+        else:
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+            d = os.path.join(root, f"site-{{digest}}")
         path = os.path.join(d, "sitecustomize.py")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(_SITE_CUSTOMIZE)
-        os.environ["HERMETIC_FLAGS_JSON"] = json.dumps(flags)
+        if os.path.exists(path):
+            return d
+        os.makedirs(d, mode=0o700, exist_ok=True)
+        # Write beside the target and rename, so a concurrent run never
+        # imports a half-written file.
+        fd, tmp_path = tempfile.mkstemp(dir=d, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(source)
+        os.replace(tmp_path, path)
+        # Pre-compile so a child on the same Python version skips parsing
+        # sitecustomize on startup. Other versions ignore the cache tag and
+        # fall back to the .py source.
+        try:
+            py_compile.compile(path, doraise=True)
+        except (py_compile.PyCompileError, OSError):
+            pass
         return d
     except Exception as e:
         raise BootstrapError(f"failed to write sitecustomize: {{e}}") from e
 """
 
 
+# Constants and pure helpers copied verbatim from hermetic.guards.network so
+# the child interpreter runs the exact allow-check used in-process.
+SHARED_NETWORK_CONSTANTS = (
+    "_METADATA_HOSTS",
+    "_LOCALHOST",
+    "_BIND_LOOPBACK_LITERALS",
+    "_DNS_TTL",
+    "_DNS_CACHE_MAX",
+)
+SHARED_NETWORK_FUNCTIONS = (
+    network._normalize_host,
+    network._build_allow_trie,
+    network._trie_allows,
+    network._make_host_matcher,
+    network._cached_getaddrinfo,
+)
+
+
+def shared_network_code():
+    """Render the network module's shared matcher as standalone source."""
+    parts = ["# --- shared network matcher ---"]
+    for name in SHARED_NETWORK_CONSTANTS:
+        value = getattr(network, name)
+        if isinstance(value, frozenset):
+            parts.append(f"{name} = frozenset({sorted(value)!r})")
+        else:
+            parts.append(f"{name} = {value!r}")
+    parts.append("_dns_cache = {}")
+    parts.append("_dns_lock = threading.Lock()")
+    for func in SHARED_NETWORK_FUNCTIONS:
+        parts.append(inspect.getsource(func).rstrip())
+    return "\n".join(parts) + "\n"
+
+
 def main():
     """Generates and writes the hermetic/bootstrap.py file."""
     print("Gathering bootstrap code from guard modules...")
@@ -116,7 +228,9 @@ def main():
     ]
 
     # Concatenate the bootstrap code from all guard modules
-    all_guards_code = "\n".join(mod.BOOTSTRAP_CODE for mod in guard_modules)
+    all_guards_code = shared_network_code() + "\n".join(
+        mod.BOOTSTRAP_CODE for mod in guard_modules
+    )
 
     # Indent the guard code to fit into the sitecustomize template
     # Strip first to avoid leading/trailing empty lines causing indentation issues
@@ -1,11 +1,16 @@
 # tests/conftest.py
+import socket
+from types import SimpleNamespace
+
 import pytest
 
 from hermetic.blocker import BlockConfig
 from hermetic.profiles import GuardConfig
 
 
-@pytest.fixture
+# Both configs are read-only value objects in every test that uses them,
+# so one instance per session is enough. Tests must not mutate them.
+@pytest.fixture(scope="session")
 def default_block_config():
     return BlockConfig(
         block_network=False,
@@ -23,7 +28,7 @@ def default_block_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def default_guard_config():
     return GuardConfig(
         no_network=False,
@@ -39,3 +44,43 @@ def default_guard_config():
         deny_imports=[],
         trace=False,
     )
+
+
+def _offline_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """Resolve every name to loopback so tests never wait on real DNS."""
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def offline_dns():
+    # Installed before any guard, so guards capture the stub as the
+    # "original" resolver and allowed lookups stay offline too.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(socket, "getaddrinfo", _offline_getaddrinfo)
+        yield
+
+
+@pytest.fixture(scope="session")
+def fs_sandbox(tmp_path_factory):
+    """Build one read-mostly directory tree shared by filesystem guard tests.
+
+    Files here must stay unchanged; tests that need to write should use a
+    per-test name under ``root``.
+    """
+    root = tmp_path_factory.mktemp("hermetic")
+    sandbox = root / "sandbox"
+    sandbox.mkdir()
+    inside = sandbox / "inside.txt"
+    inside.write_text("allowed")
+    outside = root / "outside.txt"
+    outside.write_text("forbidden")
+    existing = root / "existing.txt"
+    existing.write_text("content")
+    return SimpleNamespace(
+        root=root,
+        sandbox=sandbox,
+        inside=inside,
+        outside=outside,
+        existing=existing,
+        missing=root / "missing.txt",
+    )
@@ -2,8 +2,7 @@
 
 import pytest
 
-from hermetic import blocker as blocker_mod
-from hermetic.blocker import BlockConfig, hermetic_blocker
+from hermetic.blocker import BlockConfig
 
 
 def test_block_config_from_kwargs(default_block_config):
@@ -58,13 +57,3 @@ def test_block_config_from_kwargs(default_block_config):
 #         assert isinstance(blocker, _HermeticBlocker)
 #         assert _REFCOUNT == initial_refcount + 1
 #     assert _REFCOUNT == initial_refcount
-
-
-def test_with_hermetic_decorator():
-    @hermetic_blocker(block_network=True)
-    def test_func():
-        return True
-
-    assert blocker_mod._ACTIVE_CONFIGS == []
-    assert test_func() is True
-    assert blocker_mod._ACTIVE_CONFIGS == []
@@ -4,24 +4,48 @@ Comprehensive pytest suite for hermetic blocker.
 Focus: Entry points in blocker.py - verify guards actually block actions.
 Strategy: Minimal mocking, real filesystem/network/subprocess attempts.
 
-Import Order: All imports that might be patched (os, subprocess, etc.) must happen
-AFTER the hermetic_blocker context is entered. This matches the real use case where
-the developer controls the entrypoint and import order.
+Import Order: guards patch attributes on the os/socket/subprocess modules in place,
+so module references imported at the top of this file see the guarded functions.
+Only names bound directly (``from os import system``) before entering the blocker
+escape the guards; TestEdgeCases.test_preimported_modules_bypass_guards covers that.
 """
 
 from __future__ import annotations
 
+import ctypes  # Loaded up front so guard tests never pay the first C-extension load.
+import os
+import re
 import socket
-from pathlib import Path
+import subprocess
+import sys
 from typing import TYPE_CHECKING
 
 import pytest
 
+import hermetic.blocker as blocker_mod
 from hermetic.blocker import BlockConfig, hermetic_blocker, with_hermetic
 from hermetic.errors import PolicyViolation
 
+# Violation messages asserted by many tests, compiled once for the module.
+_NETWORK_DISABLED = re.compile("network disabled")
+_SUBPROCESS_DISABLED = re.compile("subprocess disabled")
+_FS_READONLY = re.compile("filesystem readonly")
+_MUTATION_DISABLED = re.compile("mutation disabled")
+
+# Captured before any guard runs; "unblocked" checks compare against these
+# instead of spawning a real child process.
+_ORIGINAL_SUBPROCESS_RUN = subprocess.run
+_ORIGINAL_POPEN = subprocess.Popen
+_ORIGINAL_OS_SYSTEM = os.system
+
+
+def _assert_subprocess_unpatched() -> None:
+    assert subprocess.run is _ORIGINAL_SUBPROCESS_RUN
+    assert subprocess.Popen is _ORIGINAL_POPEN
+    assert os.system is _ORIGINAL_OS_SYSTEM
+
 if TYPE_CHECKING:
-    pass
+    from pytest_mock import MockerFixture
 
 
 # ============================================================================
@@ -29,38 +53,57 @@ if TYPE_CHECKING:
 # ============================================================================
 
 
-class TestNetworkGuard:
-    """Test network blocking via hermetic_blocker context manager."""
+@pytest.fixture(scope="class")
+def network_blocked():
+    with hermetic_blocker(block_network=True):
+        yield
 
-    def test_network_blocked_socket_connect(self) -> None:
-        """Verify socket.connect raises PolicyViolation when network blocked."""
-        with hermetic_blocker(block_network=True):
-            import socket
 
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            with pytest.raises(PolicyViolation, match="network disabled"):
-                sock.connect(("example.com", 80))
+@pytest.fixture(scope="class")
+def tcp_socket(network_blocked):
+    """One guarded TCP socket shared by the connect tests of a class.
 
-    def test_network_blocked_create_connection(self) -> None:
-        """Verify socket.create_connection raises PolicyViolation."""
-        with hermetic_blocker(block_network=True):
-            with pytest.raises(PolicyViolation, match="network disabled"):
-                socket.create_connection(("example.com", 80), timeout=1)
+    Created after the guard is installed: sockets that already existed keep
+    the unguarded class.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        yield sock
 
-    def test_network_blocked_getaddrinfo(self) -> None:
-        """Verify DNS lookups are blocked."""
-        with hermetic_blocker(block_network=True):
-            with pytest.raises(PolicyViolation, match="network disabled"):
-                import socket
 
-                socket.getaddrinfo("example.com", 80)
+@pytest.mark.network_guard
+@pytest.mark.usefixtures("network_blocked")
+class TestNetworkGuardActive:
+    """Network checks that share one guard install for the whole class."""
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            lambda sock: sock.connect(("example.com", 80)),
+            lambda sock: socket.create_connection(("example.com", 80), timeout=1),
+            lambda sock: socket.getaddrinfo("example.com", 80),
+        ],
+        ids=["socket.connect", "create_connection", "getaddrinfo"],
+    )
+    def test_network_blocked(self, op, tcp_socket: socket.socket) -> None:
+        """Verify outbound network APIs raise PolicyViolation when blocked."""
+        with pytest.raises(PolicyViolation, match=_NETWORK_DISABLED):
+            op(tcp_socket)
+
+    def test_socket_connect_ex_returns_errno(self, tcp_socket: socket.socket) -> None:
+        """Verify connect_ex returns errno instead of raising."""
+        result = tcp_socket.connect_ex(("example.com", 80))
+        # Should return an error code, not 0
+        assert result != 0
+
+
+@pytest.mark.network_guard
+class TestNetworkGuard:
+    """Test network blocking variants and guard removal."""
 
     def test_network_allow_localhost(self) -> None:
         """Verify localhost is allowed when allow_localhost=True."""
         with hermetic_blocker(block_network=True, allow_localhost=True):
             # Should not raise - localhost is allowed
-            import socket
-
             info = socket.getaddrinfo("localhost", 80)
             assert len(info) > 0
 
@@ -68,23 +111,28 @@ class TestNetworkGuard:
         """Verify allowed domains can be accessed."""
         with hermetic_blocker(block_network=True, allow_domains=["example.com"]):
             # Should not raise - example.com is allowed
-            import socket
-
             info = socket.getaddrinfo("example.com", 80)
             assert len(info) > 0
 
     def test_network_allow_domains_does_not_match_substrings(self) -> None:
         """Allowlist should match exact hosts/subdomains, not arbitrary substrings."""
         with hermetic_blocker(block_network=True, allow_domains=["example.com"]):
-            with pytest.raises(PolicyViolation, match="network disabled"):
+            with pytest.raises(PolicyViolation, match=_NETWORK_DISABLED):
                 socket.getaddrinfo("badexample.com", 80)
 
-    def test_network_blocks_metadata_endpoints(self) -> None:
+    def test_network_blocks_metadata_endpoints(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Verify cloud metadata endpoints are always blocked."""
-        with hermetic_blocker(block_network=True, allow_localhost=True):
-            with pytest.raises(PolicyViolation):
-                import socket
 
+        def resolver_reached(*args: object, **kwargs: object) -> None:
+            raise OSError("resolver reached before the guard")
+
+        # The guard must decide on the host string alone; if it ever falls
+        # through to the resolver this fails fast instead of probing IMDS.
+        monkeypatch.setattr(socket, "getaddrinfo", resolver_reached)
+        with hermetic_blocker(block_network=True, allow_localhost=True):
+            with pytest.raises(PolicyViolation, match=_NETWORK_DISABLED):
                 socket.getaddrinfo("169.254.169.254", 80)
 
     def test_network_unblocked_after_exit(self) -> None:
@@ -92,26 +140,18 @@ class TestNetworkGuard:
         with hermetic_blocker(block_network=True):
             pass
         # Should work fine now
-        import socket
-
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
 
     def test_network_nested_contexts(self) -> None:
         """Verify nested contexts maintain blocking until outermost exits."""
         with hermetic_blocker(block_network=True):
-            import socket
-
             with hermetic_blocker(block_network=True):
-                import socket
-
                 with pytest.raises(PolicyViolation):
                     socket.getaddrinfo("example.com", 80)
             # Still blocked - outer context still active
             with pytest.raises(PolicyViolation):
                 socket.getaddrinfo("example.com", 80)
-        import socket
-
         # Now unblocked
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
@@ -122,59 +162,52 @@ class TestNetworkGuard:
 # ============================================================================
 
 
-class TestSubprocessGuard:
-    """Test subprocess blocking."""
-
-    def test_subprocess_popen_blocked(self) -> None:
-        """Verify subprocess.Popen raises PolicyViolation."""
-        with hermetic_blocker(block_subprocess=True):
-            with pytest.raises(PolicyViolation, match="subprocess disabled"):
-                import subprocess
-
-                subprocess.Popen(["echo", "hello"])
-
-    def test_subprocess_run_blocked(self) -> None:
-        """Verify subprocess.run raises PolicyViolation."""
-        with hermetic_blocker(block_subprocess=True):
-            with pytest.raises(PolicyViolation, match="subprocess disabled"):
-                import subprocess
-
-                subprocess.run(["echo", "hello"])
-
-    def test_subprocess_call_blocked(self) -> None:
-        """Verify subprocess.call raises PolicyViolation."""
-        with hermetic_blocker(block_subprocess=True):
-            with pytest.raises(PolicyViolation, match="subprocess disabled"):
-                import subprocess
-
-                subprocess.call(["echo", "hello"])
+@pytest.fixture(scope="class")
+def subprocess_blocked():
+    with hermetic_blocker(block_subprocess=True):
+        yield
+
+
+@pytest.mark.subprocess_guard
+@pytest.mark.usefixtures("subprocess_blocked")
+class TestSubprocessGuardActive:
+    """Subprocess checks that share one guard install for the whole class."""
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            lambda: subprocess.Popen(["echo", "hello"]),
+            lambda: subprocess.run(["echo", "hello"]),
+            lambda: subprocess.call(["echo", "hello"]),
+            lambda: os.system("echo hello"),
+        ],
+        ids=["Popen", "run", "call", "os.system"],
+    )
+    def test_subprocess_blocked(self, op) -> None:
+        """Verify process-spawning APIs raise PolicyViolation when blocked."""
+        with pytest.raises(PolicyViolation, match=_SUBPROCESS_DISABLED):
+            op()
+
+    def test_asyncio_subprocess_blocked(self) -> None:
+        """Verify asyncio subprocess creation is blocked."""
+        import asyncio
 
-    def test_os_system_blocked(self) -> None:
-        """Verify os.system raises PolicyViolation."""
-        with hermetic_blocker(block_subprocess=True):
-            import os  # Import AFTER guard installation
+        with pytest.raises(PolicyViolation, match=_SUBPROCESS_DISABLED):
+            # The guard raises when called, before asyncio.run() would
+            # build an event loop to drive the coroutine.
+            asyncio.run(asyncio.create_subprocess_exec("echo", "hello"))
 
-            with pytest.raises(PolicyViolation, match="subprocess disabled"):
-                os.system("echo hello")
 
-    @pytest.mark.asyncio
-    async def test_asyncio_subprocess_blocked(self) -> None:
-        """Verify asyncio subprocess creation is blocked."""
-        with hermetic_blocker(block_subprocess=True):
-            with pytest.raises(PolicyViolation, match="subprocess disabled"):
-                import asyncio
-
-                await asyncio.create_subprocess_exec("bash", "-c", '"echo hello"')
+@pytest.mark.subprocess_guard
+class TestSubprocessGuard:
+    """Test subprocess guard removal."""
 
     def test_subprocess_unblocked_after_exit(self) -> None:
         """Verify subprocess works after context exit."""
         with hermetic_blocker(block_subprocess=True):
             pass
         # Should work now
-        import subprocess
-
-        result = subprocess.run(["bash", "-c", "echo"], capture_output=True, text=True)
-        assert result.returncode == 0
+        _assert_subprocess_unpatched()
 
 
 # ============================================================================
@@ -182,95 +215,72 @@ class TestSubprocessGuard:
 # ============================================================================
 
 
+@pytest.mark.fs_guard
 class TestFilesystemGuard:
     """Test filesystem readonly blocking."""
 
-    def test_open_write_blocked(self, tmp_path: Path) -> None:
+    def test_open_write_blocked(self, fs_sandbox) -> None:
         """Verify opening file for write raises PolicyViolation."""
-        test_file = tmp_path / "test.txt"
         with hermetic_blocker(fs_readonly=True):
-            with pytest.raises(PolicyViolation, match="filesystem readonly"):
-                open(test_file, "w")
+            with pytest.raises(PolicyViolation, match=_FS_READONLY):
+                open(fs_sandbox.missing, "w")
 
-    def test_open_append_blocked(self, tmp_path: Path) -> None:
+    def test_open_append_blocked(self, fs_sandbox) -> None:
         """Verify opening file for append raises PolicyViolation."""
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("existing")
         with hermetic_blocker(fs_readonly=True):
-            with pytest.raises(PolicyViolation, match="filesystem readonly"):
-                open(test_file, "a")
+            with pytest.raises(PolicyViolation, match=_FS_READONLY):
+                open(fs_sandbox.existing, "a")
 
-    def test_open_read_allowed(self, tmp_path: Path) -> None:
+    def test_open_read_allowed(self, fs_sandbox) -> None:
         """Verify reading files is allowed in readonly mode."""
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("content")
         with hermetic_blocker(fs_readonly=True):
-            with open(test_file, "r") as f:
+            with open(fs_sandbox.existing, "r") as f:
                 assert f.read() == "content"
 
-    def test_pathlib_write_blocked(self, tmp_path: Path) -> None:
+    def test_pathlib_write_blocked(self, fs_sandbox) -> None:
         """Verify pathlib write operations are blocked."""
-        test_file = tmp_path / "test.txt"
         with hermetic_blocker(fs_readonly=True):
-            with pytest.raises(PolicyViolation, match="filesystem readonly"):
-                test_file.open("w")
+            with pytest.raises(PolicyViolation, match=_FS_READONLY):
+                fs_sandbox.missing.open("w")
 
-    def test_os_remove_blocked(self, tmp_path: Path) -> None:
+    def test_os_remove_blocked(self, fs_sandbox) -> None:
         """Verify os.remove raises PolicyViolation."""
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("content")
         with hermetic_blocker(fs_readonly=True):
-            import os  # Import after guard installation
+            with pytest.raises(PolicyViolation, match=_MUTATION_DISABLED):
+                os.remove(str(fs_sandbox.existing))
 
-            with pytest.raises(PolicyViolation, match="mutation disabled"):
-                os.remove(str(test_file))
-
-    def test_os_mkdir_blocked(self, tmp_path: Path) -> None:
+    def test_os_mkdir_blocked(self, fs_sandbox) -> None:
         """Verify os.mkdir raises PolicyViolation."""
-        new_dir = tmp_path / "newdir"
+        new_dir = fs_sandbox.root / "newdir"
         with hermetic_blocker(fs_readonly=True):
-            import os  # Import after guard installation
-
-            with pytest.raises(PolicyViolation, match="mutation disabled"):
+            with pytest.raises(PolicyViolation, match=_MUTATION_DISABLED):
                 os.mkdir(str(new_dir))
 
-    def test_path_touch_blocked(self, tmp_path: Path) -> None:
+    def test_path_touch_blocked(self, fs_sandbox) -> None:
         """Verify pathlib.Path.touch is treated as a filesystem mutation."""
-        test_file = tmp_path / "touch.txt"
         with hermetic_blocker(fs_readonly=True):
-            with pytest.raises(PolicyViolation, match="mutation disabled"):
-                test_file.touch()
+            with pytest.raises(PolicyViolation, match=_MUTATION_DISABLED):
+                fs_sandbox.missing.touch()
 
-    def test_utime_blocked(self, tmp_path: Path) -> None:
+    def test_utime_blocked(self, fs_sandbox) -> None:
         """Verify metadata writes are blocked too."""
-        test_file = tmp_path / "stamp.txt"
-        test_file.write_text("content")
         with hermetic_blocker(fs_readonly=True):
-            import os
+            with pytest.raises(PolicyViolation, match=_MUTATION_DISABLED):
+                os.utime(fs_sandbox.existing, None)
 
-            with pytest.raises(PolicyViolation, match="mutation disabled"):
-                os.utime(test_file, None)
-
-    def test_fs_root_restricts_reads(self, tmp_path: Path) -> None:
+    def test_fs_root_restricts_reads(self, fs_sandbox) -> None:
         """Verify fs_root parameter restricts read access."""
-        sandbox = tmp_path / "sandbox"
-        sandbox.mkdir()
-        inside = sandbox / "inside.txt"
-        inside.write_text("allowed")
-        outside = tmp_path / "outside.txt"
-        outside.write_text("forbidden")
-
-        with hermetic_blocker(fs_readonly=True, fs_root=str(sandbox)):
+        with hermetic_blocker(fs_readonly=True, fs_root=str(fs_sandbox.sandbox)):
             # Can read inside sandbox
-            with open(inside, "r") as f:
+            with open(fs_sandbox.inside, "r") as f:
                 assert f.read() == "allowed"
             # Cannot read outside sandbox
             with pytest.raises(PolicyViolation, match="outside sandbox root"):
-                open(outside, "r")
+                open(fs_sandbox.outside, "r")
 
-    def test_fs_unblocked_after_exit(self, tmp_path: Path) -> None:
+    def test_fs_unblocked_after_exit(self, fs_sandbox, request) -> None:
         """Verify filesystem mutations work after context exit."""
-        test_file = tmp_path / "test.txt"
+        test_file = fs_sandbox.root / f"{request.node.name}.txt"
         with hermetic_blocker(fs_readonly=True):
             pass
         # Should work now
@@ -283,16 +293,16 @@ class TestFilesystemGuard:
 # ============================================================================
 
 
+@pytest.mark.import_guard
 class TestImportGuard:
     """Test strict imports blocking."""
 
     def test_ctypes_import_blocked(self) -> None:
-        """Verify ctypes import raises PolicyViolation."""
+        """Verify ctypes import raises PolicyViolation even when already loaded."""
+        assert "ctypes" in sys.modules
         with hermetic_blocker(block_native=True):
             with pytest.raises(PolicyViolation, match="import blocked"):
-                import cffi
-
-                assert dir(cffi)
+                __import__("ctypes")
 
     def test_cffi_import_blocked(self) -> None:
         """Verify cffi import raises PolicyViolation (if installed)."""
@@ -314,14 +324,10 @@ class TestImportGuard:
         """Verify imports work after context exit."""
         with hermetic_blocker(block_native=True):
             pass
-        import ctypes
-
-        assert ctypes
+        assert __import__("ctypes") is ctypes
 
     def test_preimported_ctypes_ffi_usage_blocked(self) -> None:
         """Pre-imported ctypes should still lose its obvious FFI entry points."""
-        import ctypes
-
         with hermetic_blocker(block_native=True):
             with pytest.raises(PolicyViolation, match="native interface blocked"):
                 ctypes.CDLL(None)
@@ -335,53 +341,56 @@ class TestImportGuard:
 class TestMultipleGuards:
     """Test multiple guards active simultaneously."""
 
-    def test_all_guards_active(self, tmp_path: Path) -> None:
-        """Verify all guards can be active at once."""
-        test_file = tmp_path / "test.txt"
-        with hermetic_blocker(
-            block_network=True,
-            block_subprocess=True,
-            fs_readonly=True,
-            block_native=True,
-        ):
-            # Network blocked
-            with pytest.raises(PolicyViolation):
-                socket.getaddrinfo("example.com", 80)
-            # Subprocess blocked
-            with pytest.raises(PolicyViolation):
-                import subprocess
-
-                subprocess.run(["echo", "hello"])
-            # Filesystem writes blocked
-            with pytest.raises(PolicyViolation):
-                open(test_file, "w")
-            # FFI imports blocked
-            with pytest.raises(PolicyViolation):
-                import cffi
-
-                assert dir(cffi)
-
-    def test_partial_guards(self) -> None:
-        """Verify only specified guards are active."""
-        with hermetic_blocker(block_network=True):
-            # Network blocked
-            with pytest.raises(PolicyViolation):
-                import socket
-
-                socket.getaddrinfo("example.com", 80)
-            # Subprocess still works
-            import subprocess
-
-            result = subprocess.run(["bash", "-c", "echo"], capture_output=True)
-            assert result.returncode == 0
+    # (blocker flags, ops that must raise, ops that must still work)
+    CASES = (
+        (
+            {
+                "block_network": True,
+                "block_subprocess": True,
+                "fs_readonly": True,
+                "block_native": True,
+            },
+            ["net", "proc", "fs", "ffi"],
+            [],
+        ),
+        ({"block_network": True}, ["net"], ["proc"]),
+    )
+
+    @staticmethod
+    def _blocked_op(name: str, fs_sandbox) -> None:
+        if name == "net":
+            socket.getaddrinfo("example.com", 80)
+        elif name == "proc":
+            subprocess.run(["echo", "hello"])
+        elif name == "fs":
+            open(fs_sandbox.missing, "w")
+        elif name == "ffi":
+            import cffi
+
+            assert dir(cffi)
+
+    @staticmethod
+    def _unblocked_op(name: str) -> None:
+        if name == "proc":
+            _assert_subprocess_unpatched()
+
+    @pytest.mark.parametrize(
+        ("flags", "blocked", "unblocked"), CASES, ids=["all-guards", "network-only"]
+    )
+    def test_guard_combinations(self, fs_sandbox, flags, blocked, unblocked) -> None:
+        """Verify each guard set blocks exactly the surfaces it covers."""
+        with hermetic_blocker(**flags):
+            for name in blocked:
+                with pytest.raises(PolicyViolation):
+                    self._blocked_op(name, fs_sandbox)
+            for name in unblocked:
+                self._unblocked_op(name)
 
     def test_nested_contexts_merge_stricter_guards(self) -> None:
         """Inner contexts should add restrictions instead of being ignored."""
         with hermetic_blocker(block_network=True):
             with hermetic_blocker(block_subprocess=True):
                 with pytest.raises(PolicyViolation):
-                    import subprocess
-
                     subprocess.run(["bash", "-c", "echo"], capture_output=True)
 
 
@@ -393,33 +402,43 @@ class TestMultipleGuards:
 class TestBlockConfig:
     """Test BlockConfig dataclass."""
 
-    def test_from_kwargs_long_names(self) -> None:
-        """Verify from_kwargs accepts long argument names."""
-        cfg = BlockConfig.from_kwargs(
-            block_network=True,
-            block_subprocess=True,
-            fs_readonly=True,
-            block_native=True,
-            allow_localhost=True,
-            allow_domains=["example.com"],
-            trace=True,
-        )
-        assert cfg.block_network is True
-        assert cfg.block_subprocess is True
-        assert cfg.fs_readonly is True
-        assert cfg.block_native is True
-        assert cfg.allow_localhost is True
-        assert cfg.allow_domains == ["example.com"]
-        assert cfg.trace is True
-
-    def test_from_kwargs_short_names(self) -> None:
-        """Verify from_kwargs accepts short argument names."""
-        cfg = BlockConfig.from_kwargs(
-            no_network=True,
-            no_subprocess=True,
-        )
-        assert cfg.block_network is True
-        assert cfg.block_subprocess is True
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [
+            (
+                {
+                    "block_network": True,
+                    "block_subprocess": True,
+                    "fs_readonly": True,
+                    "block_native": True,
+                    "allow_localhost": True,
+                    "allow_domains": ["example.com"],
+                    "trace": True,
+                },
+                {
+                    "block_network": True,
+                    "block_subprocess": True,
+                    "fs_readonly": True,
+                    "block_native": True,
+                    "allow_localhost": True,
+                    "allow_domains": ["example.com"],
+                    "trace": True,
+                },
+            ),
+            (
+                {"no_network": True, "no_subprocess": True},
+                {"block_network": True, "block_subprocess": True},
+            ),
+        ],
+        ids=["long", "short"],
+    )
+    def test_from_kwargs(
+        self, kwargs: dict[str, object], expected: dict[str, object]
+    ) -> None:
+        """Verify from_kwargs maps long and short argument names to fields."""
+        cfg = BlockConfig.from_kwargs(**kwargs)
+        for name, value in expected.items():
+            assert getattr(cfg, name) == value
 
     def test_from_kwargs_unknown_arg_raises(self) -> None:
         """Verify unknown arguments raise TypeError."""
@@ -440,11 +459,9 @@ class TestDecorators:
 
         @hermetic_blocker(block_network=True)
         def make_request() -> None:
-            import socket
-
             socket.getaddrinfo("example.com", 80)
 
-        with pytest.raises(PolicyViolation, match="network disabled"):
+        with pytest.raises(PolicyViolation, match=_NETWORK_DISABLED):
             make_request()
 
     def test_with_hermetic_decorator(self) -> None:
@@ -453,12 +470,8 @@ class TestDecorators:
         @with_hermetic(block_network=True, block_subprocess=True)
         def restricted_func() -> str:
             with pytest.raises(PolicyViolation):
-                import socket
-
                 socket.getaddrinfo("example.com", 80)
             with pytest.raises(PolicyViolation):
-                import subprocess
-
                 subprocess.run(["echo", "hello"])
             return "success"
 
@@ -470,14 +483,11 @@ class TestDecorators:
         @hermetic_blocker(block_network=True)
         def restricted() -> None:
             with pytest.raises(PolicyViolation):
-                import socket
-
                 socket.getaddrinfo("example.com", 80)
 
         restricted()
+        assert blocker_mod._ACTIVE_CONFIGS == []
         # Should work now
-        import socket
-
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
 
@@ -487,6 +497,7 @@ class TestDecorators:
 # ============================================================================
 
 
+@pytest.mark.asyncio_block
 class TestAsyncContext:
     """Test async context manager support."""
 
@@ -494,16 +505,14 @@ class TestAsyncContext:
     async def test_async_with_blocks_network(self) -> None:
         """Verify async with blocks network."""
         async with hermetic_blocker(block_network=True):
-            with pytest.raises(PolicyViolation, match="network disabled"):
-                import socket
-
+            with pytest.raises(PolicyViolation, match=_NETWORK_DISABLED):
                 socket.getaddrinfo("example.com", 80)
 
     @pytest.mark.asyncio
     async def test_async_with_blocks_subprocess(self) -> None:
         """Verify async with blocks subprocess."""
         async with hermetic_blocker(block_subprocess=True):
-            with pytest.raises(PolicyViolation, match="subprocess disabled"):
+            with pytest.raises(PolicyViolation, match=_SUBPROCESS_DISABLED):
                 import asyncio
 
                 await asyncio.create_subprocess_exec("echo", "hello")
@@ -514,8 +523,6 @@ class TestAsyncContext:
         async with hermetic_blocker(block_network=True):
             pass
         # Should work now
-        import socket
-
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
 
@@ -536,43 +543,38 @@ class TestThreadSafety:
             try:
                 with hermetic_blocker(block_network=True):
                     with pytest.raises(PolicyViolation):
-                        import socket
-
                         socket.getaddrinfo("example.com", 80)
             except Exception as e:
                 errors.append(e)
 
-        import threading
+        from concurrent.futures import ThreadPoolExecutor
 
-        threads = [threading.Thread(target=thread_func, args=(i,)) for i in range(10)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        # A small pool still overlaps entries and exits; DNS is stubbed
+        # session-wide, so each task only exercises the blocker lock.
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            list(ex.map(thread_func, range(10)))
 
         assert len(errors) == 0, f"Thread errors: {errors}"
 
-    def test_reference_counting(self) -> None:
+    def test_reference_counting(self, mocker: MockerFixture) -> None:
         """Verify reference counting works correctly with nesting."""
+        spy = mocker.spy(blocker_mod, "_install_for_config")
         # First context
         with hermetic_blocker(block_network=True):
             # Network blocked
             with pytest.raises(PolicyViolation):
-                import socket
-
                 socket.getaddrinfo("example.com", 80)
             # Nested context
             with hermetic_blocker(block_network=True):
                 # Still blocked
                 with pytest.raises(PolicyViolation):
-                    import socket
-
                     socket.getaddrinfo("example.com", 80)
             # Still blocked after nested exit
             with pytest.raises(PolicyViolation):
-                import socket
-
                 socket.getaddrinfo("example.com", 80)
+            # Only the outer entry installed; the identical nested policy
+            # neither reinstalled on entry nor on exit.
+            assert spy.call_count == 1
         # Unblocked after all exits
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
@@ -595,8 +597,6 @@ class TestExceptionHandling:
             pass
 
         # Guards should be removed
-        import socket
-
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
 
@@ -644,20 +644,12 @@ class TestEdgeCases:
             with pytest.raises(PolicyViolation):
                 socket.getaddrinfo("example.com", 80)
 
-    def test_socket_connect_ex_returns_errno(self) -> None:
-        """Verify connect_ex returns errno instead of raising."""
-        with hermetic_blocker(block_network=True):
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex(("example.com", 80))
-            # Should return an error code, not 0
-            assert result != 0
-
     def test_udp_sendto_blocked(self) -> None:
         """Unconnected datagram sends should still be blocked."""
         with hermetic_blocker(block_network=True):
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             try:
-                with pytest.raises(PolicyViolation, match="network disabled"):
+                with pytest.raises(PolicyViolation, match=_NETWORK_DISABLED):
                     sock.sendto(b"hi", ("127.0.0.1", 9))
             finally:
                 sock.close()
@@ -694,8 +686,6 @@ class TestEdgeCases:
         # Second exit should be safe (no-op)
         blocker.__exit__(None, None, None)
         # Network should work
-        import socket
-
         info = socket.getaddrinfo("example.com", 80)
         assert len(info) > 0
 
@@ -713,13 +703,11 @@ class TestEdgeCases:
             with pytest.raises(PolicyViolation):
                 socket.getaddrinfo("example.com", 80)
 
-    @pytest.mark.parametrize("mode", ["r+", "w+", "a+", "x+"])
-    def test_open_plus_modes_blocked(self, tmp_path: Path, mode: str) -> None:
+    def test_open_plus_modes_blocked(self, fs_sandbox) -> None:
         """Verify all + modes are blocked (they allow writing)."""
-        test_file = tmp_path / "test.txt"
-        if "x" not in mode:  # x mode requires file not exist
-            test_file.write_text("content")
-
         with hermetic_blocker(fs_readonly=True):
-            with pytest.raises(PolicyViolation, match="filesystem readonly"):
-                open(test_file, mode)
+            for mode in ("r+", "w+", "a+", "x+"):
+                # x mode requires the file not to exist
+                test_file = fs_sandbox.missing if "x" in mode else fs_sandbox.existing
+                with pytest.raises(PolicyViolation, match=_FS_READONLY):
+                    open(test_file, mode)
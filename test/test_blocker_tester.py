@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import types
 
 import pytest
@@ -7,66 +8,67 @@ import pytest
 from hermetic.blocker import BlockConfig, hermetic_blocker, with_hermetic
 
 
+# Recording stand-ins for install_all/uninstall_all; reset_blocker_state
+# binds them to its calls dict with functools.partial.
+def _stub_install_all(
+    calls,
+    *,
+    net=None,
+    subproc=None,
+    fs=None,
+    env=None,
+    code=None,
+    interp=None,
+    imports=None,
+):
+    calls["install_all"].append(
+        dict(
+            net=net,
+            subproc=subproc,
+            fs=fs,
+            env=env,
+            code=code,
+            interp=interp,
+            imports=imports,
+        )
+    )
+    calls["timeline"].append("install")
+
+
+def _stub_uninstall_all(calls):
+    calls["uninstall_all"].append(True)
+    calls["timeline"].append("uninstall")
+
+
 @pytest.fixture(autouse=True)
 def reset_blocker_state(monkeypatch):
     """
-    Ensure hermetic.blocker starts each test with clean global state and
-    predictable guard stubs that *record* calls without performing real patches.
+    Start each test with an empty policy stack and guard stubs that *record*
+    calls without performing real patches.
     """
-    # Re-import to get the module; don't reload yet (we'll mutate state below).
-    import hermetic.blocker as blocker
+    from hermetic import blocker, guards
 
     # Reset lock-guarded policy state.
-    blocker._ACTIVE_CONFIGS.clear()  # noqa: SLF001
+    blocker._ACTIVE_CONFIGS.clear()
 
     calls = {
         "install_all": [],
         "uninstall_all": [],
         "timeline": [],  # order assertions: "install", "func", "uninstall"
     }
+    stub_install_all = functools.partial(_stub_install_all, calls)
+    stub_uninstall_all = functools.partial(_stub_uninstall_all, calls)
 
-    def _stub_install_all(
-        *,
-        net=None,
-        subproc=None,
-        fs=None,
-        env=None,
-        code=None,
-        interp=None,
-        imports=None,
-    ):
-        calls["install_all"].append(
-            dict(
-                net=net,
-                subproc=subproc,
-                fs=fs,
-                env=env,
-                code=code,
-                interp=interp,
-                imports=imports,
-            )
-        )
-        calls["timeline"].append("install")
-
-    def _stub_uninstall_all():
-        calls["uninstall_all"].append(True)
-        calls["timeline"].append("uninstall")
-
-    # Patch guards at the package import location the code uses.
-    import hermetic.guards as guards  # package must exist in project
-
-    monkeypatch.setattr(guards, "install_all", _stub_install_all, raising=True)
-    monkeypatch.setattr(guards, "uninstall_all", _stub_uninstall_all, raising=True)
+    # Patch guards at the package import location the code uses, and make
+    # sure blocker sees the patched names via its imports.
+    for module in (guards, blocker):
+        monkeypatch.setattr(module, "install_all", stub_install_all)
+        monkeypatch.setattr(module, "uninstall_all", stub_uninstall_all)
 
-    # Also ensure blocker sees the patched names via its imports.
-    monkeypatch.setattr(blocker, "install_all", _stub_install_all, raising=True)
-    monkeypatch.setattr(blocker, "uninstall_all", _stub_uninstall_all, raising=True)
-
-    # Provide test helper access
     yield types.SimpleNamespace(calls=calls, blocker=blocker)
 
-    # Safety: if someone forgot to exit a context, emulate a final uninstall and reset.
-    blocker._ACTIVE_CONFIGS.clear()  # noqa: SLF001
+    # Safety: if someone forgot to exit a context, reset the policy stack.
+    blocker._ACTIVE_CONFIGS.clear()
 
 
 # ---------- BlockConfig.from_kwargs mapping ----------
@@ -188,7 +190,7 @@ def test_exception_not_suppressed_and_uninstalls(reset_blocker_state):
     assert len(R.calls["uninstall_all"]) == 2
 
 
-# ---------- Decorator usage (ContextDecorator) ----------
+# ---------- Decorator usage ----------
 
 
 def test_decorator_wraps_function_and_orders_install_uninstall(reset_blocker_state):
@@ -217,6 +219,22 @@ def test_with_hermetic_alias_equivalent(reset_blocker_state):
     assert isinstance(args["subproc"], dict) and args["subproc"]["trace"] is True
 
 
+def test_decorated_recursion_restores_active_configs(reset_blocker_state):
+    from hermetic import blocker
+
+    depths = []
+
+    @hermetic_blocker(block_network=True)
+    def countdown(n):
+        depths.append(len(blocker._ACTIVE_CONFIGS))
+        if n:
+            countdown(n - 1)
+
+    countdown(2)
+    assert depths == [1, 2, 3]
+    assert blocker._ACTIVE_CONFIGS == []
+
+
 # ---------- Async context manager ----------
 
 
@@ -1,7 +1,7 @@
 # tests/test_cli.py
 
 
-from hermetic.cli import parse_hermetic_args
+from hermetic.cli import _shared_parser, parse_hermetic_args
 from hermetic.profiles import GuardConfig
 
 
@@ -51,6 +51,15 @@ def test_parse_hermetic_args_new_guards():
     assert cfg.deny_imports == ["pickle", "xml.etree"]
 
 
+def test_parse_hermetic_args_reuses_parser_without_leaking_state():
+    first = parse_hermetic_args(["--allow-domain=a.example"])
+    second = parse_hermetic_args(["--allow-domain=b.example"])
+    assert first.allow_domains == ["a.example"]
+    assert second.allow_domains == ["b.example"]
+    assert parse_hermetic_args([]).allow_domains == []
+    assert _shared_parser.cache_info().currsize == 1
+
+
 # def test_main_help(capsys):
 #     exit_code = main(["--help"])
 #     # assert exit_code == 0
@@ -1,7 +1,7 @@
 # test/test_coverage_boost.py
 import socket
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -11,6 +11,7 @@ from hermetic.guards import uninstall_all
 from hermetic.profiles import GuardConfig
 from hermetic.resolver import (
     TargetSpec,
+    _console_entries,
     _console_entry,
     _script_shebang,
     invoke_inprocess,
@@ -36,9 +37,12 @@ def test_console_entry_mocked(mocker):
     mock_eps.select.return_value = [mock_ep]
 
     mocker.patch("importlib.metadata.entry_points", return_value=mock_eps)
+    _console_entries.cache_clear()
 
     assert _console_entry("mycmd") == ("mymod", "myfunc")
     assert _console_entry("nonexistent") is None
+    mock_eps.select.assert_called_once()
+    _console_entries.cache_clear()
 
 
 def test_console_entry_legacy_fallback(mocker):
@@ -59,8 +63,10 @@ def test_console_entry_legacy_fallback(mocker):
     mock_eps_obj.__iter__.return_value = iter(mock_eps)
 
     mocker.patch("importlib.metadata.entry_points", return_value=mock_eps_obj)
+    _console_entries.cache_clear()
 
     assert _console_entry("mycmd") == ("mymod", "__main__")
+    _console_entries.cache_clear()
 
 
 def test_script_shebang_mocked(tmp_path):
@@ -145,11 +151,74 @@ def test_run_policy_violation(mocker):
 
 
 def test_write_sitecustomize_error(mocker):
+    mocker.patch("hermetic.bootstrap._site_cache_root", return_value=None)
     mocker.patch("tempfile.mkdtemp", side_effect=Exception("disk full"))
     with pytest.raises(BootstrapError):
         write_sitecustomize({})
 
 
+@pytest.fixture
+def private_tempdir(monkeypatch, tmp_path):
+    """Point tempfile at tmp_path so the real per-user site cache is untouched."""
+    import tempfile
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def test_write_sitecustomize_reuses_content_addressed_dir(mocker, tmp_path):
+    import os
+
+    root = tmp_path / "cache"
+    root.mkdir(mode=0o700)
+    mocker.patch("hermetic.bootstrap._site_cache_root", return_value=str(root))
+    first = write_sitecustomize({"no_network": True})
+    with patch("tempfile.mkstemp", side_effect=AssertionError("rewrote")):
+        assert write_sitecustomize({"no_network": True}) == first
+    assert os.path.dirname(first) == str(root)
+    assert write_sitecustomize({"no_network": False}) != first
+
+
+def test_write_sitecustomize_precompiles_bytecode(private_tempdir):
+    import importlib.util
+    import os
+
+    site_dir = write_sitecustomize({})
+    assert site_dir.startswith(str(private_tempdir))
+    source = os.path.join(site_dir, "sitecustomize.py")
+    assert os.path.exists(importlib.util.cache_from_source(source))
+
+
+def test_write_sitecustomize_bakes_flags_as_literals(private_tempdir):
+    import os
+
+    site_dir = write_sitecustomize(
+        {"no_network": True, "allow_domains": ["example.com"]}
+    )
+    assert site_dir.startswith(str(private_tempdir))
+    with open(os.path.join(site_dir, "sitecustomize.py"), encoding="utf-8") as f:
+        source = f.read()
+    assert "HERMETIC_FLAGS_JSON" not in source
+    assert "'allow_trie': {'com': {'example': {None: True}}}" in source
+    assert "HERMETIC_FLAGS_JSON" not in os.environ
+
+
+def test_render_sitecustomize_bakes_policy_literal():
+    from hermetic.bootstrap import render_sitecustomize
+
+    source = render_sitecustomize({"no_network": True, "trace": True})
+    assert "cfg = {'no_network': True, 'trace': True}" in source
+    assert "HERMETIC_FLAGS_JSON" not in source
+
+
+def test_render_sitecustomize_fails_closed_without_marker(monkeypatch):
+    from hermetic import bootstrap
+
+    monkeypatch.setattr(bootstrap, "_SITE_CUSTOMIZE", "cfg = {}\n")
+    with pytest.raises(BootstrapError, match="config marker"):
+        bootstrap.render_sitecustomize({"no_network": True})
+
+
 def test_config_to_flags():
     cfg = GuardConfig(no_network=True, trace=True, sealed=True)
     flags = config_to_flags(cfg)
@@ -0,0 +1,32 @@
+# tests/test_guards/conftest.py
+import pytest
+
+from hermetic.guards import imports_guard as imports_mod
+from hermetic.guards import network as network_mod
+from hermetic.guards import subprocess_guard as subprocess_mod
+
+
+# Each fixture installs one guard and always uninstalls it on teardown, so a
+# failing assertion cannot leak a patched socket/subprocess/import hook into
+# later tests.
+@pytest.fixture
+def network_guard():
+    network_mod.install(allow_localhost=True, allow_domains=["example.com"], trace=True)
+    yield
+    network_mod.uninstall()
+
+
+@pytest.fixture
+def subprocess_guard():
+    subprocess_mod.install(trace=True)
+    yield
+    subprocess_mod.uninstall()
+
+
+# Class-scoped: the imports guard tests that share it sit in one class, while
+# the rest of test_import_guards.py installs the guard with other options.
+@pytest.fixture(scope="class")
+def imports_guard():
+    imports_mod.install(trace=True)
+    yield
+    imports_mod.uninstall()
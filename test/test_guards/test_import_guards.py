@@ -5,19 +5,19 @@ import pytest
 
 from hermetic.blocker import hermetic_blocker
 from hermetic.errors import PolicyViolation
-from hermetic.guards.imports_guard import install, uninstall
+from hermetic.guards.imports_guard import _is_denied_import, install, uninstall
 
 
-def test_imports_guard():
-    install(trace=True)
-    try:
-
-        with pytest.raises(PolicyViolation, match="import blocked: ctypes"):
-            import ctypes
-
-            assert dir(ctypes)
-    finally:
-        uninstall()
+@pytest.mark.usefixtures("imports_guard")
+class TestImportsGuard:
+    @pytest.mark.parametrize("modname", ["ctypes", "_ctypes", "cffi", "_cffi_backend"])
+    def test_ffi_import_blocked(self, modname):
+        before = sys.modules.get(modname)
+        with pytest.raises(PolicyViolation, match=f"import blocked: {modname}"):
+            __import__(modname)
+        # The guard refuses before the import machinery runs: whatever was
+        # cached (or not) stays untouched.
+        assert sys.modules.get(modname) is before
 
 
 def test_imports_guard_deny_import_prefix():
@@ -60,3 +60,26 @@ def test_imports_guard_keeps_meta_path_guard_when_combined():
 
         with pytest.raises(PolicyViolation, match="sys.meta_path"):
             sys.meta_path.append(object())
+
+
+def test_is_denied_import_matches_dotted_prefixes_only():
+    deny = frozenset({"pickle", "xml.etree"})
+    assert _is_denied_import("pickle", deny)
+    assert _is_denied_import("xml.etree", deny)
+    assert _is_denied_import("xml.etree.ElementTree", deny)
+    assert not _is_denied_import("xml", deny)
+    assert not _is_denied_import("xml.dom", deny)
+    assert not _is_denied_import("pickletools", deny)
+
+
+def test_guarded_ext_loader_is_reused_across_installs():
+    original = mach.ExtensionFileLoader
+    install(block_native=True)
+    first = mach.ExtensionFileLoader
+    uninstall()
+    install(block_native=True)
+    second = mach.ExtensionFileLoader
+    uninstall()
+    assert first is second
+    assert first is not original
+    assert mach.ExtensionFileLoader is original
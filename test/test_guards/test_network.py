@@ -1,22 +1,34 @@
 # tests/test_guards/test_network.py
 import socket
+import sys
 import threading
 
 import pytest
 
 from hermetic.errors import PolicyViolation
-from hermetic.guards.network import install, uninstall
+from hermetic.guards.network import (
+    _build_allow_trie,
+    _trie_allows,
+    install,
+    uninstall,
+)
 
 
-def test_network_guard():
-    install(allow_localhost=True, allow_domains=["example.com"], trace=True)
-    try:
-        sock = socket.socket()
+def test_network_guard(monkeypatch, network_guard):
+    # Stand in for the kernel connect on the unguarded base class: the guard's
+    # wrapper calls through via super().connect, so an allowed host lands
+    # here without any real I/O.
+    reached = []
+    monkeypatch.setattr(
+        socket.socket.__base__,
+        "connect",
+        lambda self, address: reached.append(address),
+    )
+    with socket.socket() as sock:
         sock.connect(("example.com", 80))  # Allowed
         with pytest.raises(PolicyViolation, match="network disabled: connect"):
             sock.connect(("google.com", 80))
-    finally:
-        uninstall()
+    assert reached == [("example.com", 80)]
 
 
 def test_network_guard_blocks_raw_socket_aliases():
@@ -61,3 +73,80 @@ def test_network_guard_blocks_raw_socket_aliases():
         server.close()
         thread.join(timeout=1)
         assert not accepted.is_set()
+
+
+def test_allow_trie_matches_domain_and_subdomains_only():
+    trie = _build_allow_trie(["Example.COM.", "api.internal", ""])
+    assert _trie_allows(trie, "example.com")
+    assert _trie_allows(trie, "www.example.com")
+    assert _trie_allows(trie, "a.b.api.internal")
+    assert not _trie_allows(trie, "badexample.com")
+    assert not _trie_allows(trie, "com")
+    assert not _trie_allows(trie, "internal")
+    assert not _trie_allows(trie, "")
+
+
+def test_policy_decisions_are_memoized_per_install():
+    from hermetic.guards import network
+
+    install(allow_localhost=False, allow_domains=["example.com"])
+    try:
+        with pytest.raises(PolicyViolation):
+            socket.getaddrinfo("blocked.test", 80)
+        with pytest.raises(PolicyViolation):
+            socket.getaddrinfo("blocked.test", 80)
+        info = network._is_allowed_cached.cache_info()
+        assert info.hits == 1 and info.misses == 1
+    finally:
+        uninstall()
+    assert network._is_allowed_cached is None
+
+
+def test_allowed_getaddrinfo_results_are_cached_until_uninstall(monkeypatch):
+    from hermetic.guards import network
+
+    calls = []
+
+    def fake_getaddrinfo(host, port, *args, **kwargs):
+        calls.append((host, port))
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    install(allow_localhost=False, allow_domains=["example.com"])
+    try:
+        first = socket.getaddrinfo("example.com", 443)
+        first.clear()
+        second = socket.getaddrinfo("example.com", 443)
+        socket.getaddrinfo("example.com", 80)
+        assert len(second) == 1
+        assert calls == [("example.com", 443), ("example.com", 80)]
+    finally:
+        uninstall()
+    assert not network._dns_cache
+
+
+def test_cached_getaddrinfo_evicts_safely_under_concurrency(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from hermetic.guards import network
+
+    monkeypatch.setattr(network, "_DNS_CACHE_MAX", 2)
+    cache = {}
+
+    def resolve(host, port):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+    def lookup(i):
+        return network._cached_getaddrinfo(cache, resolve, f"h{i % 8}", (80,), {})
+
+    # Switch threads as often as possible so evictions overlap.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lookup, range(4000)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert all(len(r) == 1 for r in results)
+    assert len(cache) <= 2
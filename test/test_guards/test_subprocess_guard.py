@@ -7,14 +7,20 @@ import pytest
 from hermetic.errors import PolicyViolation
 from hermetic.guards.subprocess_guard import install, uninstall
 
-
-def test_subprocess_guard():
-    install(trace=True)
-    try:
-        with pytest.raises(PolicyViolation, match="subprocess disabled"):
-            subprocess.run(["echo", "test"])
-    finally:
-        uninstall()
+# Captured at import, before any guard rebinds subprocess.Popen.
+_REAL_POPEN = subprocess.Popen
+
+
+def test_subprocess_guard(monkeypatch, subprocess_guard):
+    # If the guard ever let the call through, Popen would get as far as
+    # spawning a child; fail loudly instead of forking.
+    monkeypatch.setattr(
+        _REAL_POPEN,
+        "_execute_child",
+        lambda *a, **k: pytest.fail("reached real Popen._execute_child"),
+    )
+    with pytest.raises(PolicyViolation, match="subprocess disabled"):
+        subprocess.run(["echo", "test"])
 
 
 @pytest.mark.skipif(sys.platform != "win32", reason="Windows-only primitive")
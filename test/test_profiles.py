@@ -21,3 +21,22 @@ def test_apply_profile():
 
     with pytest.raises(SystemExit, match="unknown profile: invalid"):
         apply_profile(base, "invalid")
+
+
+def test_apply_profile_extends_lists_without_mutating_base(monkeypatch):
+    from hermetic import profiles
+
+    monkeypatch.setitem(
+        profiles.PROFILES, "allow-b", GuardConfig(allow_domains=["b.example"])
+    )
+    profiles._profile_overrides.cache_clear()
+    try:
+        base = GuardConfig(allow_domains=["a.example"])
+        first = apply_profile(base, "allow-b")
+        second = apply_profile(base, "allow-b")
+        assert first.allow_domains == ["a.example", "b.example"]
+        assert second.allow_domains == ["a.example", "b.example"]
+        assert base.allow_domains == ["a.example"]
+        assert profiles._profile_overrides.cache_info().hits == 1
+    finally:
+        profiles._profile_overrides.cache_clear()
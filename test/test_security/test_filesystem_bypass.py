@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import io
+import os
 import shutil
 
 import pytest
@@ -43,3 +44,57 @@ def test_shutil_move_blocked(tmp_path):
             shutil.move(str(src), str(tmp_path / "b"))
     finally:
         uninstall()
+
+
+def test_fs_root_at_filesystem_root_allows_reads(tmp_path):
+    target = tmp_path / "inside.txt"
+    target.write_text("ok")
+    install(fs_root=os.path.abspath(os.sep), trace=False)
+    try:
+        with open(target) as f:
+            assert f.read() == "ok"
+    finally:
+        uninstall()
+
+
+def test_fs_root_rechecks_relative_path_after_chdir(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    outside = tmp_path / "outside"
+    root.mkdir()
+    outside.mkdir()
+    (root / "f.txt").write_text("inside")
+    (outside / "f.txt").write_text("secret")
+    monkeypatch.chdir(root)
+    install(fs_root=str(root), trace=False)
+    try:
+        with open("f.txt") as f:
+            assert f.read() == "inside"
+        # Same relative string, different cwd: must be resolved afresh.
+        os.chdir(outside)
+        with pytest.raises(PolicyViolation, match="outside sandbox"), open("f.txt"):
+            pass
+    finally:
+        uninstall()
+
+
+def test_fs_root_rechecks_symlink_after_retarget(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "f.txt").write_text("inside")
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    link = root / "link.txt"
+    link.symlink_to(root / "f.txt")
+    install(fs_root=str(root), trace=False)
+    try:
+        with open(link) as f:
+            assert f.read() == "inside"
+        # Re-point the link outside the root with the guard's originals.
+        from hermetic.guards import filesystem
+
+        filesystem._originals["os.unlink"](link)
+        filesystem._originals["os.symlink"](secret, link)
+        with pytest.raises(PolicyViolation, match="outside sandbox"), open(link):
+            pass
+    finally:
+        uninstall()